@@ -9,18 +9,26 @@ from .utils import SubCmd
 
 log = logging.getLogger()
 
+# sub command name -> help shown in the command list
+SUB_CMDS = {
+    "debug": "Debug commands",
+    "sync": "Sync command",
+    "list": "List files at provider",
+}
+
 def main():
     """cloudsync command line main"""
 
-    logging.basicConfig(format='%(asctime)s,%(msecs)d %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s',
-            datefmt='%Y-%m-%d:%H:%M:%S',)
-
     parser = argparse.ArgumentParser(description='cloudsync - monitor and sync between cloud providers')
     cmds = parser.add_subparsers(title="Commands")
 
     cmds.metavar = "Commands:"
-    sub_cmds = ["debug", "sync", "list"]
-    for sub_cmd in sub_cmds:
+    # only import the module for the command being run, the rest just need to show up in usage
+    chosen = next((arg for arg in sys.argv[1:] if not arg.startswith("-")), None)
+    for sub_cmd, sub_help in SUB_CMDS.items():
+        if sub_cmd != chosen:
+            cmds.add_parser(sub_cmd, help=sub_help)
+            continue
         module: Any = importlib.import_module(".." + sub_cmd, __name__)
         cmd: SubCmd = module.cmd_class(cmds)
 
@@ -31,9 +39,15 @@ def main():
 
     parser.parse_args(namespace=args)
 
-    log.setLevel(logging.INFO)
+    # source file/line are only worth formatting when debugging
     if args.verbose:
+        logging.basicConfig(format='%(asctime)s,%(msecs)d %(levelname)-8s [%(filename)s:%(lineno)d] %(message)s',
+                datefmt='%Y-%m-%d:%H:%M:%S',)
         log.setLevel(logging.DEBUG)
+    else:
+        logging.basicConfig(format='%(asctime)s %(levelname)-8s %(message)s',
+                datefmt='%Y-%m-%d:%H:%M:%S',)
+        log.setLevel(logging.INFO)
     log.debug("args %s", args.__dict__)
 
     if not args.func:
@@ -251,6 +251,15 @@ class HierarchicalCache:
             else:
                 yield child_node, child_path
 
+    def _walk_nodes(self, node: Node) -> Generator[Node, None, None]:
+        # like _walk, without building a path for every node
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.type == DIRECTORY:
+                stack.extend(node.children.values())
+
     def walk(self, *, oid: str = None, path: str = None) -> Generator[str, None, None]:
         """
         Walks the cache depth first from the node specified by oid. if oid is not set walks the node specified by path
@@ -319,13 +328,9 @@ class HierarchicalCache:
         """
         node = self._get_node(oid=oid, path=path)
         if node:
-            # Recursively delete the children to ensure they are popped from the oid_to_node dict
-            if node.type == DIRECTORY:
-                children = list(node.children.values())
-                for child_node in children:
-                    log.debug("about to delete child %s:%s", child_node.oid, child_node.full_path())
-                    self.delete(oid=child_node.oid, path=child_node.full_path())
-            log.debug("about to delete parent %s:%s", node.oid, node.full_path())
+            # _delete pops the oids of all the children in the same pass, so a whole subtree is
+            # dropped without re-resolving each child by oid and path
+            log.debug("about to delete %s:%s", node.oid, node.full_path())
             self._delete(node)
 
     def _delete(self, remove_node):
@@ -338,7 +343,7 @@ class HierarchicalCache:
             pass
 
         curr_node: Node
-        for curr_node, _ignored_curr_path in self._walk(remove_node):
+        for curr_node in self._walk_nodes(remove_node):
             if curr_node.oid:
                 self._oid_to_node.pop(curr_node.oid, None)
 
@@ -42,7 +42,7 @@ class LongPollManager(Runnable):
             log.debug("about to short poll")
             generator = self.short_poll()
             if generator is not None:
-                for event in self.short_poll():
+                for event in generator:
                     log.debug("short poll returned an event, yielding %s", event)
                     has_items = True
                     yield event
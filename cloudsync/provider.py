@@ -4,11 +4,15 @@ Module exports the 'Provider' abstract base class as well as the 'Hash', 'Cursor
 from abc import ABC, abstractmethod
 import re
 import os
+import sys
 import logging
 import random
 import time
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Generator, Optional, List, Union, Tuple, Dict, BinaryIO, Iterator
+from typing import TYPE_CHECKING, Generator, Optional, List, Union, Tuple, Dict, BinaryIO, Pattern, Deque, Iterable
 
 from .types import OInfo, DIRECTORY, DirInfo, Any
 from .exceptions import CloudFileNotFoundError, CloudFileExistsError, CloudTokenError, CloudNamespaceError, \
@@ -29,6 +33,7 @@ Cursor = Union[Dict[str, 'Cursor'], Tuple['Cursor', ...], str, int, bytes, float
 Creds = Dict[str, Union[str, int]]
 
 CONNECTION_NOT_NEEDED = "connection-not-needed"
+PATH_CACHE_SIZE = 8192
 
 __all__ = ["Provider", "Namespace", "Creds", "Hash", "Cursor", "CONNECTION_NOT_NEEDED"]
 
@@ -64,6 +69,91 @@ class Namespace:
         return self.name
 
 
+def _rstrip_sep(sep: str, path: str) -> str:
+    # str.rstrip takes a set of characters, so multi-char separators have to be stripped whole
+    if len(sep) == 1:
+        return path.rstrip(sep)
+    while path.endswith(sep):
+        path = path[:-len(sep)]
+    return path
+
+
+def _lstrip_sep(sep: str, path: str) -> str:
+    if len(sep) == 1:
+        return path.lstrip(sep)
+    while path.startswith(sep):
+        path = path[len(sep):]
+    return path
+
+
+# path helpers are pure functions of the provider's path settings, so results are shared
+# by every instance with the same settings, and bounded so long syncs can't grow them forever
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def _split_path(sep: str, alt_sep: str, path: str) -> Tuple[str, str]:
+    if path:
+        path = path.replace(alt_sep, sep) if alt_sep else path
+        path = _rstrip_sep(sep, path) if path != sep else path
+    head, found, tail = path.rpartition(sep)
+    if not found:
+        return "", path
+    return head or sep, tail
+
+
+def _join_parts(sep: str, alt_sep: str, win_paths: bool, parts: Iterable[str]) -> str:
+    norm_paths: List[str] = []
+    first = True
+    for path in parts:
+        if alt_sep:
+            path = path.replace(alt_sep, sep)
+        # a component of only separators is dropped before it can count as the first one, but a bare sep is not
+        if path != sep:
+            path = _rstrip_sep(sep, path)
+            if not path:
+                continue
+        if first:
+            path = _rstrip_sep(sep, path)
+            first = False
+        else:
+            path = _lstrip_sep(sep, _rstrip_sep(sep, path))
+        if path:
+            norm_paths.append(path)
+
+    if not norm_paths:
+        return sep
+
+    joined_path = sep.join(norm_paths)
+    if not joined_path.startswith(sep) and not (win_paths and len(joined_path) > 1 and joined_path[1] == ':'):
+        joined_path = sep + joined_path
+    return joined_path
+
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def _join_pair(sep: str, alt_sep: str, win_paths: bool, parent: str, name: str) -> str:
+    return _join_parts(sep, alt_sep, win_paths, [part for part in (parent, name) if part])
+
+
+@functools.lru_cache(maxsize=PATH_CACHE_SIZE)
+def _normalize_path(sep: str, alt_sep: str, sep_re: Pattern, win_paths: bool, case_sensitive: bool,     # pylint: disable=too-many-arguments
+                    for_display: bool, path: str) -> str:
+    if path:
+        path = path.replace(alt_sep, sep) if alt_sep else path
+        path = _rstrip_sep(sep, path) if path != sep else path
+    # collapse separator runs in place, rather than a split/join round trip
+    norm_path = sep_re.sub(sep, path) or sep
+    if not norm_path.startswith(sep) and not (win_paths and len(norm_path) > 1 and norm_path[1] == ':'):
+        norm_path = sep + norm_path
+
+    if case_sensitive:
+        return norm_path
+    if for_display:
+        # lower everything but the leaf
+        index = norm_path.rfind(sep)
+        if index == -1:
+            return norm_path
+        return norm_path[:index].lower() + norm_path[index:]
+    return norm_path.lower()
+
+
 class Provider(ABC):                    # pylint: disable=too-many-public-methods
     """
     File storage provider.
@@ -89,6 +179,7 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
     _oauth_info: OAuthProviderInfo = None     ; """OAuth providers can set this as a class variable"""
     _oauth_config: OAuthConfig = None         ; """OAuth providers can set this in init"""
     _listdir_page_size: Optional[int] = None  ; """Used for testing listdir"""
+    _walk_concurrency: int = 0                ; """Threads listing subfolders ahead of a recursive walk, 0 is serial"""
 
     # these are defined here for testing purposes only
     # providers setting these values will have them overridden and used for
@@ -99,10 +190,18 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
     connection_id: Optional[str] = None       ; """Must remain constant between logins and must be unique to the login"""
     _creds: Optional[Any] = None              ; """Base class helpers to store creds"""
     __connected = False                       ; """Base class helper to fake a connection"""
+    _parent_cache_ttl: float = 0              ; """Seconds a verified parent folder is trusted, 0 disables"""
+    __verified_parents: Optional[Dict[str, float]] = None   ; """Normalized parent path -> expiry time"""
 
     sync_state: 'SyncStateLookup' = None      ; """Access to sync engine state for this provider"""
+    _sep_re: Pattern = re.compile("(?:/)+")   ; """Precompiled separator-run pattern, recomputed per subclass"""
     # pylint: enable=multiple-statements
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # compile once per class, instead of on every call to normalize_path
+        cls._sep_re = re.compile(f"(?:{re.escape(cls.sep)})+")
+
     @abstractmethod
     def _api(self, *args, **kwargs):
         """Central function that wraps calls to the provider's api.
@@ -423,18 +522,64 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
             pass
 
     def _walk(self, path, oid, recursive):
+        if recursive and self._walk_concurrency > 1:
+            yield from self._walk_concurrent(path, oid)
+            return
         try:
             for ent in self.listdir(oid):
                 current_path = self.join(path, ent.name)
                 event = Event(otype=ent.otype, oid=ent.oid, path=current_path, hash=ent.hash, exists=True, mtime=time.time())
                 # log.debug("walk %s", event)
                 yield event
-                if ent.otype == DIRECTORY and recursive:
-                    yield from self._walk(current_path, ent.oid, recursive)
+                if ent.otype == DIRECTORY:
+                    # the listing already proves this is a folder, save a later parent check
+                    self._remember_verified_parent(current_path)
+                    if recursive:
+                        yield from self._walk(current_path, ent.oid, recursive)
         except CloudFileNotFoundError:
             # folders that disappear are not in the walk
             pass
 
+    def _walk_concurrent(self, path, oid):
+        """Breadth first walk, listing upcoming folders on a thread pool while events are consumed.
+
+        Parents are still yielded before their children.  Outstanding listings are capped, so a wide
+        tree can't queue up more than a few pages of results per thread.
+        """
+        def list_folder(folder_oid):
+            try:
+                return list(self.listdir(folder_oid))
+            except CloudFileNotFoundError:
+                # folders that disappear are not in the walk
+                return []
+
+        max_pending = 4 * self._walk_concurrency
+        unlisted: Deque[Tuple[str, str]] = deque()
+        listing: Deque[Tuple[str, Future]] = deque()
+        pool = ThreadPoolExecutor(max_workers=self._walk_concurrency, thread_name_prefix="walk")
+        try:
+            listing.append((path, pool.submit(list_folder, oid)))
+            while listing:
+                folder_path, future = listing.popleft()
+                for ent in future.result():
+                    current_path = self.join(folder_path, ent.name)
+                    yield Event(otype=ent.otype, oid=ent.oid, path=current_path, hash=ent.hash, exists=True, mtime=time.time())
+                    if ent.otype == DIRECTORY:
+                        self._remember_verified_parent(current_path)
+                        unlisted.append((current_path, ent.oid))
+                # folders already submitted all precede the unlisted ones, so this keeps breadth first order
+                while unlisted and len(listing) < max_pending:
+                    sub_path, sub_oid = unlisted.popleft()
+                    listing.append((sub_path, pool.submit(list_folder, sub_oid)))
+        finally:
+            # an abandoned walk shouldn't leave the pool listing folders nobody will read
+            if sys.version_info >= (3, 9):
+                pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                for _, future in listing:
+                    future.cancel()
+                pool.shutdown(wait=False)
+
     def walk(self, path, recursive=True):
         """List all files recursively, yielded as events"""
         info = self.info_path(path)
@@ -453,70 +598,43 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
 # HELPER
 
     @classmethod
-    def __normalize_path_list(cls, paths) -> Generator[str, None, None]:
+    def __flatten_path_list(cls, paths) -> Generator[str, None, None]:
         """
-        Removes blank paths, normalizes separators, expands included iterables
-
-        This is important because we don't want to lstrip the first element, and if the first
-        element is a list, then we don't want to lstrip only the first element of that list.
-        Not lstripping the first path component (which would require readding the leading sep after the join
-        was done every time) allows for support of filesystems that either want 0 leading separators,
-        such as "c:\" on windows, or that want >1 leading separators, such as windows UNC
-        paths which begin with double slashes
+        Removes blank paths, expands included iterables
         """
         for path in paths:
             if isinstance(path, str):
-                norm_path = cls.normalize_path_separators(path)
-                if norm_path:
-                    yield norm_path
+                if path:
+                    yield path
             elif path:
-                yield from cls.__normalize_path_list(path)
-
-    @classmethod
-    def __strip_path_list(cls, path_iterator: Iterator) -> Generator[str, None, None]:
-        """
-        Removes trailing separators from all paths in path_iterator,
-        and leading separators from 'cdr' of path_iterator
-        """
-        try:
-            path = next(path_iterator)
-            stripped = path.rstrip(cls.sep)
-            if stripped:
-                yield stripped
-        except StopIteration:
-            return
-        for path in path_iterator:
-            stripped = path.strip(cls.sep)
-            if stripped:
-                yield stripped
+                yield from cls.__flatten_path_list(path)
 
     @classmethod
     def join(cls, *paths: Union[str, List[str], Tuple[str]]):
         """
         Joins a list of path strings in a provider-specific manner.
 
+        Separators are normalized, trailing separators are removed from all components, and
+        leading separators are removed from all but the first component.
+
+        This is important because we don't want to lstrip the first element, and if the first
+        element is a list, then we don't want to lstrip only the first element of that list.
+        Not lstripping the first path component (which would require readding the leading sep after the join
+        was done every time) allows for support of filesystems that either want 0 leading separators,
+        such as "c:\" on windows, or that want >1 leading separators, such as windows UNC
+        paths which begin with double slashes
+
         Args:
             paths: zero or more paths
         """
-        norm_paths: List[str] = list(cls.__strip_path_list(cls.__normalize_path_list(paths)))
-        if norm_paths:
-            joined_path = cls.sep.join(norm_paths)
-            if not cls.win_paths or joined_path[1] != ':':
-                if joined_path[0] != cls.sep:
-                    joined_path = cls.sep + joined_path
-            return joined_path
-        else:
-            return cls.sep
+        if len(paths) == 2 and type(paths[0]) is str and type(paths[1]) is str:
+            # (parent, name) is by far the most common call, and listings keep repeating the same pairs
+            return _join_pair(cls.sep, cls.alt_sep, cls.win_paths, paths[0], paths[1])
+        return _join_parts(cls.sep, cls.alt_sep, cls.win_paths, cls.__flatten_path_list(paths))
 
     def split(self, path):
         """Splits a path into a dirname, filename, just like 1os.path.split()1"""
-        path = self.normalize_path_separators(path)
-        index = path.rfind(self.sep)
-        if index == -1:
-            return "", path
-        if index == 0:
-            return self.sep, path[index + 1:]
-        return path[:index], path[index+1:]
+        return _split_path(self.sep, self.alt_sep, path)
 
     @classmethod
     def normalize_path_separators(cls, path: str):
@@ -526,7 +644,7 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
         """
         if path:
             path = path.replace(cls.alt_sep, cls.sep) if cls.alt_sep else path
-            path = path.rstrip(cls.sep) if path != cls.sep else path
+            path = _rstrip_sep(cls.sep, path) if path != cls.sep else path
         return path
 
     def normalize_path(self, path: str, for_display: bool = False):
@@ -536,48 +654,58 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
             path: the path to normalize
             for_display: when true, preserve case of path's leaf node
         """
-        path = self.normalize_path_separators(path)
-        parts = re.split(f"[{re.escape(self.sep)}]+", path)
-        norm_path = self.join(*parts)
+        return _normalize_path(self.sep, self.alt_sep, self._sep_re, self.win_paths, self.case_sensitive, for_display, path)
 
-        if self.case_sensitive:
-            return norm_path
-        elif for_display:
-            return self.join(self.dirname(norm_path).lower(), self.basename(norm_path))
-        return norm_path.lower()
+    @staticmethod
+    def clear_path_cache():
+        """Clears the cached results of split(), join() and normalize_path(), shared by all providers."""
+        _split_path.cache_clear()
+        _join_pair.cache_clear()
+        _normalize_path.cache_clear()
 
     def is_subpath(self, folder, target, strict=False):
         """True if the target is within the folder.
 
+        Separators are normalized on both paths.  On case insensitive providers only the
+        prefix of target is case folded for comparison, so the relative path returned
+        preserves the case of target.
+
         Args:
             folder: the directory
             target: the potential sub-file or folder
             strict: whether to return True if folder==target
+
+        Returns:
+            False if target is not within folder, sep if target is folder, otherwise the
+            part of target that follows folder (always beginning with sep)
         """
         if not folder or not target:
             return False
 
-        folder_full = self.normalize_path_separators(folder)
-        target_full = self.normalize_path_separators(target)
+        if folder is target:
+            return False if strict else self.sep
+
+        folder = self.normalize_path_separators(folder)
+        target = self.normalize_path_separators(target)
+
+        flen = len(folder)
+        if len(target) < flen:
+            return False
 
         # .lower() instead of normcase because normcase will also mess with separators
-        if not self.case_sensitive:
-            folder_full_case = folder_full.lower()
-            target_full_case = target_full.lower()
-        else:
-            folder_full_case = folder_full
-            target_full_case = target_full
+        if self.case_sensitive:
+            if not target.startswith(folder):
+                return False
+        elif target[:flen].lower() != folder.lower():
+            return False
 
-        # target is same as folder, or target is a subpath (ensuring separator is there for base)
-        if folder_full_case == target_full_case:
+        if len(target) == flen:
             return False if strict else self.sep
-        if folder_full_case == self.sep and target_full_case[0] == self.sep:
-            return target_full
-        elif len(target_full) > len(folder_full) and target_full[len(folder_full)] == self.sep:
-            if target_full_case.startswith(folder_full_case):
-                return target_full[len(folder_full):]
-            else:
-                return False
+        if folder == self.sep:
+            return target
+        # startswith, rather than indexing one char, so multi-char separators are honored
+        if target.startswith(self.sep, flen):
+            return target[flen:]
         return False
 
     def is_subpath_of_root(self, target, strict=False):
@@ -593,13 +721,20 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
     def replace_path(self, path, from_dir, to_dir):
         """Replaces from_dir with to_dir in path, but only if from_dir `is_subpath` of path."""
         relative = self.is_subpath(from_dir, path)
-        if relative:
-            return self.normalize_path_separators(to_dir) + (relative if relative != self.sep else "")
-        raise ValueError("replace_path used without subpath")
+        if not relative:
+            raise ValueError("replace_path used without subpath")
+        to_dir = self.normalize_path_separators(to_dir)
+        if relative == self.sep:
+            return to_dir
+        if to_dir == self.sep:
+            # relative already starts with sep, don't double it
+            return relative
+        return to_dir + relative
 
     def paths_match(self, patha, pathb, for_display=False):
         """True if two paths are equal, uses normalize_path()."""
-        if patha is None and pathb is None:
+        if patha == pathb:
+            # covers both None, and the common case of identical spellings
             return True
         elif patha is None or pathb is None:
             return False
@@ -619,6 +754,10 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
     def _verify_parent_folder_exists(self, path):
         parent_path = self.dirname(path)
         if parent_path != self.sep:
+            if self.__verified_parents:
+                expiry = self.__verified_parents.get(self.normalize_path(parent_path))
+                if expiry is not None and time.monotonic() < expiry:
+                    return
             parent_obj = self.info_path(parent_path)
             if parent_obj is None:
                 # perhaps this should separate "FileNotFound" and "non-folder parent exists"
@@ -626,6 +765,28 @@ class Provider(ABC):                    # pylint: disable=too-many-public-method
                 raise CloudFileNotFoundError(parent_path)
             if parent_obj.otype != DIRECTORY:
                 raise CloudFileExistsError(parent_path)
+            self._remember_verified_parent(parent_path)
+
+    def _remember_verified_parent(self, path):
+        """Records that path is known to be a folder, if _parent_cache_ttl is set."""
+        if self._parent_cache_ttl:
+            if self.__verified_parents is None:
+                self.__verified_parents = {}
+            self.__verified_parents[self.normalize_path(path)] = time.monotonic() + self._parent_cache_ttl
+
+    def _forget_verified_parents(self, path=None):
+        """Drops cached parent folder checks at or beneath path, or all of them if path is None.
+
+        Providers that set _parent_cache_ttl must call this when they delete or rename folders.
+        """
+        if not self.__verified_parents:
+            return
+        if path is None:
+            self.__verified_parents.clear()
+            return
+        # other threads insert while events are being processed, so iterate over a snapshot
+        for norm_parent in [p for p in list(self.__verified_parents) if self.is_subpath(path, p)]:
+            self.__verified_parents.pop(norm_parent, None)
 
     def globalize_oid(self, oid: str) -> str:       # pylint: disable=no-self-use
         """Converts an oid that may be account specific to one that can be used in other accounts."""
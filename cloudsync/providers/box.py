@@ -3,6 +3,9 @@ import logging
 import json
 import hashlib
 import time
+import datetime
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Optional, Generator, Dict, Tuple, Any, List, Union
 import requests
 import arrow
@@ -12,9 +15,10 @@ from boxsdk import Client, JWTAuth, OAuth2
 from boxsdk.object.item import Item as BoxItem
 from boxsdk.object.folder import Folder as BoxFolder
 from boxsdk.object.file import File as BoxFile
-from boxsdk.object.event import Event as BoxEvent
 from boxsdk.exception import BoxAPIException, BoxNetworkException, BoxOAuthException, BoxValueError
 from boxsdk.session.session import Session, AuthorizedSession
+from boxsdk.network.default_network import DefaultNetwork
+from boxsdk.pagination.marker_based_object_collection import MarkerBasedObjectCollection
 
 from cloudsync.hierarchical_cache import HierarchicalCache
 from cloudsync import Provider, OInfo, DIRECTORY, FILE, NOTKNOWN, Event, DirInfo, OType, LongPollManager
@@ -51,13 +55,32 @@ def patched_request(*a, **kw):
 
 Session.request = patched_request  # type: ignore
 
+HASH_BLOCK_SIZE = 256 * 1024
+
+# event source json type -> (otype, whether the source carries a content hash), other sources are ignored
+EVENT_SOURCE_TYPES: Dict[str, Tuple[OType, bool]] = {
+    'file': (FILE, True),
+    'folder': (DIRECTORY, False),
+    'web_link': (FILE, False),
+}
+
+# (status, code) of a BoxAPIException -> the exception raised in its place
+BOX_API_ERRORS: Dict[Tuple[int, str], type] = {
+    (400, 'folder_not_empty'): CloudFileExistsError,
+    (400, 'invalid_grant'): CloudTokenError,
+    (404, 'not_found'): CloudFileNotFoundError,
+    (404, 'trashed'): CloudFileNotFoundError,
+    (405, 'method_not_allowed'): PermissionError,
+    (409, 'item_name_in_use'): CloudFileExistsError,
+}
+
 
 class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """
     Box.com cloud provider
     """
-    _events_to_track = ['ITEM_COPY', 'ITEM_CREATE', 'ITEM_MODIFY', 'ITEM_MOVE', 'ITEM_RENAME', 'ITEM_TRASH',
-                        'ITEM_UNDELETE_VIA_TRASH', 'ITEM_UPLOAD']
+    _events_to_track = frozenset(('ITEM_COPY', 'ITEM_CREATE', 'ITEM_MODIFY', 'ITEM_MOVE', 'ITEM_RENAME', 'ITEM_TRASH',
+                                  'ITEM_UNDELETE_VIA_TRASH', 'ITEM_UPLOAD'))
 
     _oauth_info = OAuthProviderInfo(auth_url='https://account.box.com/api/oauth2/authorize',  # self._auth_url,
                                     token_url="https://api.box.com/oauth2/token",  # self._token_url,
@@ -67,9 +90,16 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
     _events_endpoint = '/events'
     name = 'box'
     _listdir_page_size = 5000
+    _items_concurrency = 4
+    _items_max_offset = 10000  # box rejects folder item offsets past this
+    _walk_concurrency = 4
+    _seen_events_max = 10000
+    _not_found_ttl = 3.0
+    _not_found_max = 1024
     default_sleep = 10
-    _generic_fields = ('size', 'modified_at', 'content_modified_at', 'name', 'object_id', 'sha1',
-                       'object_type', 'item_collection', 'path_collection')
+    # only what the oinfo/metadata/path code reads, box always sends type, id and etag.
+    # item_collection is ignored by box for files.
+    _generic_fields = ('size', 'content_modified_at', 'name', 'sha1', 'item_collection', 'path_collection')
 
     def __init__(self, oauth_config: Optional[OAuthConfig] = None):
         """
@@ -82,18 +112,25 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
 
         self.__cursor: Optional[Cursor] = None
         self.__client: Client = None
+        self.__guard: Optional['BoxProvider._BoxProviderGuard'] = None
+        self.__unlocked_guard: Optional['BoxProvider._BoxProviderGuard'] = None
         self.__creds: Optional[Dict[str, str]] = None
         self.__long_poll_config: Dict[str, Any] = {}
         self.__long_poll_session = requests.Session()
+        # kept across reconnects, so the sdk's pooled connections to box survive a new client
+        self.__network = DefaultNetwork()
         self._long_poll_timeout = 120
 
         self.__access_token: Optional[str] = None
+        self.__long_poll_headers: Dict[str, str] = {}
         self._mutex = threading.RLock()
 
         self._oauth_config = oauth_config
         self._long_poll_manager = LongPollManager(self._short_poll, self._long_poll, short_poll_only=False)
         self._ids: Dict[str, str] = {}
-        self.__seen_events: Dict[str, float] = {}
+        self.__seen_events: 'OrderedDict[str, float]' = OrderedDict()
+        # ("oid"|"path", key) -> monotonic expiry, for lookups that just came back not found
+        self.__not_found: 'OrderedDict[Tuple[str, str], float]' = OrderedDict()
         self.__event_sequence: Dict[str, int] = {}
         metadata_template = {"hash": str, "mtime": float, "readonly": bool, "shared": bool, "size": int}
         # TODO: hardcoding '0' as the root oid seems fishy... we should be *asking* for the root oid,
@@ -106,7 +143,8 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
         with self._api() as client:
             url = client.user(user_id='me').get_url()
             log.debug("url = %s", url)
-            user = client.make_request('GET', url).json()
+            # only the fields read below
+            user = client.make_request('GET', url, params={'fields': 'space_used,space_amount,login'}).json()
             log.debug("json resp = %s", user)
             # {'type': 'user', 'id': '8506151483', 'name': 'Atakama JWT',
             # 'login': 'AutomationUser_813890_GmcM3Cohcy@boxdevedition.com',
@@ -127,7 +165,7 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
 
     def _store_refresh_token(self, access_token, refresh_token):
         self.__creds = {"access_token": access_token, "refresh_token": refresh_token}
-        self.__access_token = access_token
+        self._set_access_token(access_token)
         self._oauth_config.creds_changed(self.__creds)
 
     # noinspection PyUnresolvedReferences
@@ -148,31 +186,36 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
                     if not ((self._oauth_config.app_id and self._oauth_config.app_secret) and (refresh_token or access_token)):
                         raise CloudTokenError("require app_id/secret and either access_token or refresh token")
 
+                box_session = Session(network_layer=self.__network)
+                box_kwargs = box_session.get_constructor_kwargs()
+                box_kwargs["api_config"] = boxsdk.config.API
+                box_kwargs["default_network_request_kwargs"] = {"timeout": 60}
+                auth: Union[JWTAuth, OAuth2]
+
+                if jwt_token:
+                    jwt_dict = json.loads(jwt_token)
+                    user_id = creds.get('user_id')
+                    auth = JWTAuth.from_settings_dictionary(jwt_dict, user=user_id,
+                                                            store_tokens=self._store_refresh_token)
+                else:
+                    if not refresh_token:
+                        raise CloudTokenError("Missing refresh token")
+                    auth = OAuth2(client_id=self._oauth_config.app_id,
+                                  client_secret=self._oauth_config.app_secret,
+                                  access_token=access_token,
+                                  refresh_token=refresh_token,
+                                  store_tokens=self._store_refresh_token)
+
+                box_session = AuthorizedSession(auth, **box_kwargs)
+                client = Client(auth, box_session)
+                root_id = client.root_folder().object_id
+                # building the client makes no requests, so only the swap itself needs the mutex
                 with self._mutex:
-                    box_session = Session()
-                    box_kwargs = box_session.get_constructor_kwargs()
-                    box_kwargs["api_config"] = boxsdk.config.API
-                    box_kwargs["default_network_request_kwargs"] = {"timeout": 60}
-                    auth: Union[JWTAuth, OAuth2]
-
-                    if jwt_token:
-                        jwt_dict = json.loads(jwt_token)
-                        user_id = creds.get('user_id')
-                        auth = JWTAuth.from_settings_dictionary(jwt_dict, user=user_id,
-                                                                store_tokens=self._store_refresh_token)
-                    else:
-                        if not refresh_token:
-                            raise CloudTokenError("Missing refresh token")
-                        auth = OAuth2(client_id=self._oauth_config.app_id,
-                                      client_secret=self._oauth_config.app_secret,
-                                      access_token=access_token,
-                                      refresh_token=refresh_token,
-                                      store_tokens=self._store_refresh_token)
-
-                    box_session = AuthorizedSession(auth, **box_kwargs)
-                    self.__client = Client(auth, box_session)
+                    self.__client = client
+                    self.__guard = self.__unlocked_guard = None
+                    self.__root_id = root_id
                 with self._api():
-                    self.__access_token = auth.access_token
+                    self._set_access_token(auth.access_token)
                     self._long_poll_manager.start()
             except BoxNetworkException as e:
                 log.exception("Error during connect %s", e)
@@ -188,65 +231,90 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
         with self._api() as client:
             return client.user(user_id='me').get().id
 
+    def _set_access_token(self, access_token):
+        self.__access_token = access_token
+        # built once per token, instead of on every long poll
+        self.__long_poll_headers = {'Authorization': 'Bearer %s' % (access_token,)}
+
     def disconnect(self):
         super().disconnect()
         self._long_poll_manager.stop(forever=False)
-        self.__client = None
+        with self._mutex:
+            self.__client = None
+            self.__guard = self.__unlocked_guard = None
         self.connection_id = None
 
     # noinspection PyBroadException,PyProtectedMember
     class _BoxProviderGuard:
-        def __init__(self, client: Client, box):
+        def __init__(self, client: Client, box, locked=True):
             assert isinstance(client, Client)
             self.__client = client
             self.__box = box
+            self.__locked = locked
+
+        @property
+        def client(self) -> Client:
+            return self.__client
 
         def __enter__(self) -> Client:
-            self.__box._mutex.__enter__()
+            if self.__locked:
+                self.__box._mutex.__enter__()
             return self.__client
 
-        def __exit__(self, ty, ex, tb):  # pylint: disable=too-many-branches
-            self.__box._mutex.__exit__(ty, ex, tb)
+        def __exit__(self, ty, ex, tb):
+            if self.__locked:
+                self.__box._mutex.__exit__(ty, ex, tb)
 
             if ex:
-                try:
-                    raise ex
-                except (TimeoutError,):
-                    self.__box.disconnect()
-                    raise CloudDisconnectedError("disconnected on timeout")
-                except BoxOAuthException as e:
-                    self.__box.disconnect()
-                    raise CloudTokenError("oauth fail %s" % e)
-                except BoxNetworkException as e:
-                    self.__box.disconenct()
-                    raise CloudDisconnectedError("disconnected %s" % e)
-                except BoxValueError:
-                    raise CloudFileNotFoundError()
-                except BoxAPIException as e:
-                    if e.status == 400 and e.code == 'folder_not_empty':
-                        raise CloudFileExistsError()
-                    if e.status == 404 and e.code == 'not_found':
-                        raise CloudFileNotFoundError()
-                    if e.status == 404 and e.code == 'trashed':
-                        raise CloudFileNotFoundError()
-                    if e.status == 405 and e.code == 'method_not_allowed':
-                        raise PermissionError()
-                    if e.status == 409 and e.code == 'item_name_in_use':
-                        raise CloudFileExistsError()
-                    if e.status == 400 and e.code == 'invalid_grant':
-                        raise CloudTokenError()
-                    log.exception("unknown box exception: \n%s", e)
-                except CloudException:
-                    raise
-                except Exception:
-                    pass  # this will not swallow the exception, because this is in a context manager
+                self.translate(self.__box, ex)
+
+        @staticmethod
+        def translate(box, ex):
+            """Raises the cloud exception for a box sdk exception, returns if there is none."""
+            try:
+                raise ex
+            except (TimeoutError,):
+                box.disconnect()
+                raise CloudDisconnectedError("disconnected on timeout")
+            except BoxOAuthException as e:
+                box.disconnect()
+                raise CloudTokenError("oauth fail %s" % e)
+            except BoxNetworkException as e:
+                box.disconnect()
+                raise CloudDisconnectedError("disconnected %s" % e)
+            except BoxValueError:
+                raise CloudFileNotFoundError()
+            except BoxAPIException as e:
+                cloud_error = BOX_API_ERRORS.get((e.status, e.code))
+                if cloud_error:
+                    raise cloud_error()
+                log.exception("unknown box exception: \n%s", e)
+            except CloudException:
+                raise
+            except Exception:
+                pass  # the caller re-raises the original exception
 
     # noinspection PyProtectedMember
     def _api(self, *args, **kwargs) -> 'BoxProvider._BoxProviderGuard':
         needs_client = kwargs.get('needs_client', True)
-        if needs_client and not self.__client:
+        client = self.__client
+        if needs_client and not client:
             raise CloudDisconnectedError("currently disconnected")
-        return self._BoxProviderGuard(self.__client, self)
+        # the guard holds no per-call state, so one per client is shared by all calls and threads
+        # connect and disconnect swap the client, so a guard is only reused if it was made for this one
+        locked = kwargs.get('locked', True)
+        guard = self.__guard if locked else self.__unlocked_guard
+        if guard is not None and guard.client is client:
+            return guard
+        with self._mutex:
+            guard = self._BoxProviderGuard(client, self, locked=locked)
+            if client is self.__client:
+                if locked:
+                    self.__guard = guard
+                else:
+                    # for transfers that touch no provider state: translates exceptions, but doesn't take the mutex
+                    self.__unlocked_guard = guard
+        return guard
 
     @property
     def latest_cursor(self) -> Optional[Cursor]:
@@ -260,7 +328,10 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
     @property
     def current_cursor(self) -> Cursor:
         if not self.__cursor:
-            self.__cursor = self.latest_cursor
+            with self._mutex:
+                # threads racing on a cold start share one fetch
+                if not self.__cursor:
+                    self.__cursor = self.latest_cursor
         return self.__cursor
 
     @current_cursor.setter
@@ -280,11 +351,10 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             log.warning("No access token in long poll")
         try:
             if self.__long_poll_config.get('retries_remaining', 0) < 1:
-                log.debug("creds = %s", self.__creds)
-                headers = {'Authorization': 'Bearer %s' % (self.__access_token,)}
-                log.debug("headers: %s", headers)
+                # the same session is used for the options and get calls, so its connections are kept alive
                 srv_resp: requests.Response = self.__long_poll_session.options(self._base_box_url + self._events_endpoint,
-                                                                               headers=headers, timeout=timeout)
+                                                                               headers=self.__long_poll_headers,
+                                                                               timeout=timeout)
                 log.debug("response content is %s, %s", srv_resp.status_code, srv_resp.content)
                 if not 200 <= srv_resp.status_code < 300:
                     raise CloudTokenError(srv_resp)
@@ -296,8 +366,9 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
                 }
             srv_resp = self.__long_poll_session.get(self.__long_poll_config.get('url'),
                                                     timeout=timeout)  # long poll
-            srv_resp_dict = srv_resp.json()
-            log.debug("server message is %s", srv_resp_dict.get('message'))
+            if log.isEnabledFor(logging.DEBUG):
+                # the body is only read for this log line, don't parse it otherwise
+                log.debug("server message is %s", srv_resp.json().get('message'))
             return True
         except requests.exceptions.ReadTimeout:  # need new long poll server:
             log.debug('Timeout during long poll')
@@ -309,63 +380,99 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
     def events(self) -> Generator[Event, None, None]:  # pylint: disable=method-hidden
         yield from self._long_poll_manager()
 
-    def _short_poll(self) -> Generator[Event, None, None]:  # pylint: disable=too-many-locals
+    def _short_poll(self) -> Generator[Event, None, None]:  # pylint: disable=too-many-locals, too-many-branches
         # see: https://developer.box.com/en/reference/resources/realtime-servers/
         log.debug("inside _short_poll() cursor = %s", self.current_cursor)
+        # raw json: the sdk's translated event objects are slow to read, and we only need a few fields
         with self._api() as client:
-            response = client.events().get_events(limit=100, stream_position=self.current_cursor)
+            params = {'limit': 100, 'stream_position': self.current_cursor, 'stream_type': 'all'}
+            response = client.make_request('GET', client.events().get_url(), params=params).json()
         new_position = response.get('next_stream_position')
-        change: BoxEvent
         if new_position:
             self.current_cursor = new_position
         else:
             log.error("No new cursor from Box\n", stack_info=True)
-        for change in (i for i in response.get('entries') if i.get('event_type')):
+        tracked = self._events_to_track
+        seen_events = self.__seen_events
+        parse_time = self._parse_time
+        # oid -> path for items whose path had to be fetched, a batch often touches one item many times
+        path_memo: Dict[str, Optional[str]] = {}
+        # checked once per batch, the per-event debug lines are skipped entirely when debug logging is off
+        debug = log.isEnabledFor(logging.DEBUG)
+        # previews, downloads, collaboration changes, etc. never change content, drop them before anything else
+        for change in (i for i in response.get('entries') or () if i.get('event_type') in tracked):
+            event_id = change.get('event_id')
             change_source = change.get('source')
-            with self._api() as client:
-                if self.__seen_events.get(change.event_id):  # type: ignore
-                    change_source_info = ""
-                    if change_source:
-                        change_source_info = str(change_source)
-                    log.debug("skipped duplicate event %s, %s", change.event_id, change_source_info)  # type: ignore
-                    continue
-                log.debug("got event %s %s", change.event_id, self.current_cursor)  # type: ignore
-                log.debug("event type is %s", change.get('event_type'))
-                self.__seen_events[change.event_id] = time.monotonic()  # type: ignore
-                ts = arrow.get(change.get('created_at')).float_timestamp
-                log.debug("change source is %s", change_source)
-                previous_sequence: int = self.__event_sequence.get(change_source.id)
-                if previous_sequence:
-                    try:
-                        current_sequence = int(change_source.sequence_id)
-                    except ValueError:  # couldn't convert to int for some reason?
-                        pass
-                    if current_sequence:
-                        if current_sequence < previous_sequence:
-                            log.debug("skipped earlier event for OID %s", change_source.id)
-                            continue
-                        self.__event_sequence[change_source.id] = current_sequence
-
-                if isinstance(change_source, BoxItem):
-                    otype = DIRECTORY if type(change_source) is BoxFolder else FILE
-                    oid = change_source.id  # type: ignore
-                    path = self._box_get_path(client, change_source)
-                    ohash = change_source.sha1 if type(change_source) is BoxFile else None  # type: ignore
-                    exists = change_source.item_status == 'active'  # type: ignore
-                else:
-                    log.debug("ignoring event type %s source type %s", change.get('event_type'), type(change_source))
-                    continue
+            if event_id in seen_events:
+                if debug:
+                    log.debug("skipped duplicate event %s, %s", event_id, change_source or "")
+                continue
+            if debug:
+                log.debug("got event %s %s, type %s, source %s", event_id, self.current_cursor, change.get('event_type'), change_source)
+            seen_events[event_id] = time.monotonic()
+            while len(seen_events) > self._seen_events_max:
+                seen_events.popitem(last=False)
+            ts = parse_time(change.get('created_at'))
+            source_type = change_source.get('type') if change_source else None
+            otype_hashed = EVENT_SOURCE_TYPES.get(source_type)
+            if otype_hashed is None:
+                if debug:
+                    log.debug("ignoring event type %s source type %s", change.get('event_type'), source_type)
+                continue
+
+            oid = change_source['id']
+            previous_sequence: int = self.__event_sequence.get(oid)
+            if previous_sequence:
+                current_sequence = None
+                try:
+                    current_sequence = int(change_source.get('sequence_id'))
+                except (TypeError, ValueError):  # couldn't convert to int for some reason?
+                    pass
+                if current_sequence:
+                    if current_sequence < previous_sequence:
+                        log.debug("skipped earlier event for OID %s", oid)
+                        continue
+                    self.__event_sequence[oid] = current_sequence
+
+            otype, hashed = otype_hashed
+            old_path = self.__cache.get_path(oid)
+            old_type = self.__cache.get_type(oid=oid)
+            path = self._box_get_event_path(change_source, otype, old_path, path_memo)
+            ohash = change_source.get('sha1') if hashed else None
+            exists = change_source.get('item_status') == 'active'
 
             event = Event(otype, oid, path, ohash, exists, ts, new_cursor=new_position)
+            self.__forget_not_found(oid, path)
 
-            old_path = self.__cache.get_path(oid)
-            old_type = self.__cache.get_type(oid=oid)
             if (path and old_path != path) or old_type == DIRECTORY:
                 self.__cache.delete(path=path)
 
             # this MUST NOT BE IN A WITH BLOCK
             yield event
 
+    def _box_get_event_path(self, source: Dict[str, Any], otype: OType, cached_path: Optional[str],
+                            memo: Dict[str, Optional[str]]) -> Optional[str]:
+        # same lookup order as _box_get_path, but reading the raw event json
+        oid = source['id']
+        if otype == DIRECTORY and oid == self.__root_id:
+            return self.sep
+        if cached_path:
+            return cached_path
+        if source.get('path_collection') is not None:
+            return self._get_path_from_collection(source['path_collection'], source.get('name'))
+        # the fetched path is the item's current path, so it is the same for every event in the batch
+        if oid not in memo:
+            with self._api() as client:
+                if otype == DIRECTORY:
+                    box_object = client.folder(oid)
+                elif source.get('type') == 'web_link':
+                    # web links are reported as files, but box only knows their ids under /web_links
+                    box_object = client.web_link(oid)
+                else:
+                    box_object = client.file(oid)
+                memo[oid] = self._box_get_path(client, box_object)
+        return memo[oid]
+
     def upload(self, oid, file_like, metadata=None) -> OInfo:
         with self._api() as client:
             box_object: BoxItem = self._get_box_object(client, oid=oid, object_type=FILE, strict=False)
@@ -373,7 +480,9 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
                 raise CloudFileNotFoundError()
             if box_object.object_type != 'file':
                 raise CloudFileExistsError()
+        with self._api(locked=False):
             new_object = box_object.update_contents_with_stream(file_like)  # type: ignore
+        with self._api() as client:
             retval = self._box_get_oinfo(client, new_object)
             return retval
 
@@ -383,10 +492,18 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             parent_object = self._get_box_object(client, path=parent, object_type=DIRECTORY)
             if parent_object is None:
                 raise CloudFileNotFoundError()
-            # TODO: implement preflight_check on the upload_stream() call
-            new_object: BoxFile = parent_object.upload_stream(file_stream=file_like, file_name=base)  # type: ignore
+        try:
+            with self._api(locked=False):
+                # TODO: implement preflight_check on the upload_stream() call
+                new_object: BoxFile = parent_object.upload_stream(file_stream=file_like, file_name=base)  # type: ignore
+        except CloudFileExistsError:
+            # someone else created it since it was last looked up
+            self.__forget_not_found(None, path)
+            raise
+        with self._api() as client:
             log.debug("caching id %s for file %s", new_object.object_id, path)
             self.__cache.create(path, new_object.object_id)
+            self.__clear_not_found()
             retval = self._box_get_oinfo(client, new_object, parent_path=parent)
             return retval
 
@@ -395,55 +512,65 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             box_object: BoxItem = self._get_box_object(client, oid=oid, object_type=FILE)
             if box_object is None:
                 raise CloudFileNotFoundError()
+        with self._api(locked=False):
             box_object.download_to(writeable_stream=file_like)  # type: ignore
 
     def rename(self, oid, path) -> str:  # pylint: disable=too-many-branches
-        self.__cache.delete(path=path)
-        try:
-            with self._api() as client:
-                box_object: BoxItem = self._get_box_object(client, oid=oid, object_type=NOTKNOWN, strict=False)  # todo: get object_type from cache
-                if box_object is None:
-                    self.__cache.delete(oid=oid)
-                    raise CloudFileNotFoundError()
-                info = self._box_get_oinfo(client, box_object)
-                if info.path:
-                    old_path = info.path
-                else:
-                    old_path = self._box_get_path(client, box_object)
-                old_parent, _ignored_old_base = self.split(old_path)
-                new_parent, new_base = self.split(path)
-                if new_parent == old_parent:
-                    try:
-                        with self._api():
-                            retval = box_object.rename(new_base)
-                    except CloudFileExistsError:
-                        if box_object.object_type == 'file':
-                            raise
-                        # are we renaming a folder over another empty folder?
-                        box_conflict = self._get_box_object(client, path=path, object_type=NOTKNOWN, strict=False)  # todo: get type from cache
-
-                        # should't happen... we just got a FEx error, and we're not moving
-                        if box_conflict is None:  # pragma: no cover
-                            raise
-                        items = self._box_get_items(client, box_conflict, new_parent)
-                        if box_conflict.object_type == 'folder' and len(items) == 0:
-                            box_conflict.delete()
-                        else:
-                            raise
-                        return self.rename(oid, path)
-                else:
-                    new_parent_object = self._get_box_object(client, path=new_parent, object_type=DIRECTORY, strict=False)
-                    if new_parent_object is None:
+        # the cache delete, the move and the cache fix-up all happen under the mutex, so other box calls
+        # never observe the cache half way through a rename
+        with self._mutex:
+            self.__cache.delete(path=path)
+            try:
+                with self._api() as client:
+                    box_object: BoxItem = self._get_box_object(client, oid=oid, object_type=NOTKNOWN, strict=False)  # todo: get object_type from cache
+                    if box_object is None:
+                        self.__cache.delete(oid=oid)
                         raise CloudFileNotFoundError()
-                    if new_parent_object.object_type != 'folder':
-                        raise CloudFileExistsError()
-
-                    retval = box_object.move(parent_folder=new_parent_object, name=new_base)
-                self.__cache.rename(old_path, path)
-                return retval.id
-        except Exception:
-            self.__cache.delete(oid=oid)
-            raise
+                    info = self._box_get_oinfo(client, box_object)
+                    if info.path:
+                        old_path = info.path
+                    else:
+                        old_path = self._box_get_path(client, box_object)
+                    old_parent, _ignored_old_base = self.split(old_path)
+                    new_parent, new_base = self.split(path)
+                    if new_parent == old_parent:
+                        try:
+                            with self._api():
+                                retval = box_object.rename(new_base)
+                        except CloudFileExistsError:
+                            if box_object.object_type == 'file':
+                                raise
+                            # are we renaming a folder over another empty folder?
+                            self.__forget_not_found(None, path)
+                            box_conflict = self._get_box_object(client, path=path, object_type=NOTKNOWN, strict=False)  # todo: get type from cache
+
+                            # should't happen... we just got a FEx error, and we're not moving
+                            if box_conflict is None:  # pragma: no cover
+                                raise
+                            items = self._box_get_items(client, box_conflict, new_parent)
+                            if box_conflict.object_type == 'folder' and len(items) == 0:
+                                box_conflict.delete()
+                            else:
+                                raise
+                            return self.rename(oid, path)
+                    else:
+                        new_parent_object = self._get_box_object(client, path=new_parent, object_type=DIRECTORY, strict=False)
+                        if new_parent_object is None:
+                            raise CloudFileNotFoundError()
+                        if new_parent_object.object_type != 'folder':
+                            raise CloudFileExistsError()
+
+                        retval = box_object.move(parent_folder=new_parent_object, name=new_base)
+                    self.__cache.rename(old_path, path)
+                    self.__clear_not_found()
+                    return retval.id
+            except CloudFileExistsError:
+                self.__forget_not_found(None, path)
+                self.__cache.delete(oid=oid)
+                raise
+            except Exception:
+                self.__cache.delete(oid=oid)
+                raise
 
     def mkdir(self, path) -> str:
         info = self.info_path(path)
@@ -460,11 +587,13 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
                         raise CloudFileNotFoundError()
                     child_object: BoxFolder = parent_object.create_subfolder(base)  # type: ignore
                     self.__cache.mkdir(path, child_object.object_id)
+                    self.__clear_not_found()
                     log.debug("MKDIR ---------------- path=%s oid=%s", path, child_object.object_id)
 
                     return child_object.object_id
             except CloudFileExistsError as e:
                 self.__cache.delete(path=path)
+                self.__forget_not_found(None, path)
                 try:
                     box_object = self._get_box_object(client, path=path, object_type=DIRECTORY, strict=False)
                 except Exception:
@@ -482,13 +611,15 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             if box_object is None:
                 return
 
+            is_root = self._box_object_is_root(client, box_object)
             if box_object.object_type == 'file':
                 box_object.delete()
-            elif self._box_object_is_root(client, box_object):
-                for info in self.listdir(oid):
-                    self.rmtree(info.oid)
-            else:
+            elif not is_root:
                 box_object.delete(recursive=True)
+        if is_root:
+            # listdir prefetches pages on another thread, so it can't run under the mutex
+            for info in list(self.listdir(oid)):
+                self.rmtree(info.oid)
         self.__cache.delete(oid=oid)
 
     def delete(self, oid):
@@ -507,11 +638,8 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             return True
         try:
             with self._api() as client:
-                box_object = self._get_box_object(client, oid=oid, object_type=NOTKNOWN, strict=False)  # NOTKNOWN because it's not cached
-                if box_object is None:
-                    return False
-                self._unsafe_box_object_populate(client, box_object)
-                return True
+                # NOTKNOWN because it's not cached. the lookup by oid already fetched the object, so it exists if found
+                return self._get_box_object(client, oid=oid, object_type=NOTKNOWN, strict=False) is not None
         except CloudFileNotFoundError:
             return False
 
@@ -526,78 +654,140 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             page_size = 5000
         if box_object.object_type == 'file':
             return []
-        entries = list(box_object.get_items(limit=page_size, fields=self._generic_fields))  # type: ignore
+        entries = self.__box_list_all_items(box_object, page_size)
         if not path:
             path = self._box_get_path(client, box_object)
         self._cache_collection_entries(client, entries, path)
         return entries
 
+    def __box_list_all_items(self, box_object: BoxFolder, page_size: int) -> List[BoxItem]:
+        # The first page gives the total count, then the remaining pages are fetched concurrently.
+        # Folders past the offset cap are listed sequentially with marker pages instead.
+        # The caller holds the box mutex, so the workers only make raw session calls and never enter _api().
+        session = box_object.session
+        url = box_object.get_url('items')
+        fields = ','.join(self._generic_fields)
+
+        def fetch(offset: int, limit: int) -> Dict[str, Any]:
+            return session.get(url, params={'offset': offset, 'limit': limit, 'fields': fields}).json()
+
+        # pick the paging strategy before listing, so a big folder doesn't waste an offset page
+        # folders fetched with _generic_fields already carry the count, otherwise ask for it with a 1 item page
+        collection = getattr(box_object, 'item_collection', None) or {}
+        total = collection.get('total_count')
+        if total is None:
+            total = fetch(0, 1).get('total_count') or 0
+        if total > self._items_max_offset:
+            # too big for offsets, so walk it page by page with markers instead
+            return [entry for page in MarkerBasedObjectCollection(session=session, url=url, limit=page_size,
+                                                                  fields=self._generic_fields, return_full_pages=True,
+                                                                  supports_limit_offset_paging=True)
+                    for entry in page]
+        first = fetch(0, page_size)
+        pages = [first.get('entries') or []]
+        total = first.get('total_count') or 0
+        # box caps the page size (1000 for folder items), the response says what it actually used
+        limit = first.get('limit') or len(pages[0])
+        if limit and total > limit:
+            offsets = range(limit, total, limit)
+            with ThreadPoolExecutor(max_workers=min(self._items_concurrency, len(offsets)),
+                                    thread_name_prefix="box-items") as pool:
+                # map keeps offset order, so entries come back in box's listing order
+                pages.extend(page.get('entries') or [] for page in pool.map(lambda offset: fetch(offset, limit), offsets))
+        translator = box_object.translator
+        return [translator.translate(session, entry) for page in pages for entry in page]
+
+    def _box_get_item_pages(self, box_object: BoxFolder, path: str,
+                            page_size: Optional[int] = 5000) -> Generator[List[BoxItem], None, None]:
+        # Yields the children of box_object one page at a time, caching each page.
+        # The next page is fetched in the background while the caller works through the current one,
+        # so this must not be iterated while holding the box mutex.
+        # marker paging: each page costs box the same, however deep into the folder it is
+        pages = iter(MarkerBasedObjectCollection(session=box_object.session, url=box_object.get_url('items'),
+                                                 limit=page_size or 5000, fields=self._generic_fields,
+                                                 return_full_pages=True, supports_limit_offset_paging=True))
+
+        def fetch() -> Optional[List[BoxItem]]:
+            # only this worker touches pages, so the request itself doesn't need the mutex,
+            # which lets concurrent walks list their folders in parallel
+            with self._api(locked=False):
+                page = next(pages, None)
+                if page is None:
+                    return None
+                entries = list(page)
+            with self._api() as client:
+                self._cache_collection_entries(client, entries, path)
+            return entries
+
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="listdir")
+        future: Optional[Future] = None
+        try:
+            future = pool.submit(fetch)
+            while True:
+                entries = future.result()
+                if entries is None:
+                    break
+                future = pool.submit(fetch)
+                yield entries
+        finally:
+            if future:
+                future.cancel()
+            pool.shutdown(wait=False)
+
     def listdir(self, oid) -> Generator[DirInfo, None, None]:
-        entries: List[BoxItem] = []
         with self._api() as client:
             parent_object = self._get_box_object(client, oid=oid, object_type=DIRECTORY)
             if parent_object is None:
                 raise CloudFileNotFoundError()
             parent_path = self._box_get_path(client, parent_object)
 
-            # shitty attempt 1 that fails due to caching in the sdk:
-            # entries = parent_object.item_collection['entries']  # don't use this, new children may be missing
-
-            # shitty attempt 2 that fails due to caching in the sdk:
-            entries = self._box_get_items(client, parent_object, parent_path, page_size=self._listdir_page_size)
-        for entry in entries:
-            retval = None
-            with self._api() as client:
-                if type(entry) is dict:  # Apparently, get_box_object by path returns dicts and by oid returns objects?
-                    raise NotImplementedError
-                retval = self._box_get_dirinfo(client, entry, parent_path)
-            if retval is not None:
-                yield retval
-
-            # attempt 3 that (hopefully) avoids those issues, and gets newly created items
-            # see https://github.com/box/box-python-sdk#making-api-calls-manually
-
-            # url = parent_object.get_url('items')
-            # log.debug("url = %s", url)
-            # json_response = client.make_request('GET', url).json()
-            # log.debug("json resp = %s", json_response)
-            # for entry in json_response['entries']:
-            #     log.debug("entry = %s", entry)
-            #     collection_entry = self._box_get_dirinfo_from_collection_entry(entry, parent_path)
-            #     log.debug("collection_entry = %s", collection_entry)
-            #     yield collection_entry
+        # don't use parent_object.item_collection['entries'], new children may be missing due to caching in the sdk
+        for entries in self._box_get_item_pages(parent_object, parent_path, page_size=self._listdir_page_size):
+            for entry in entries:
+                with self._api() as client:
+                    retval = self._box_get_dirinfo(client, entry, parent_path)
+                if retval is not None:
+                    yield retval
 
     def hash_data(self, file_like) -> Hash:
         # get a hash from a filelike that's the same as the hash i natively use
         sha1 = hashlib.sha1()
-        for c in iter(lambda: file_like.read(32768), b''):
-            sha1.update(c)
+        if hasattr(file_like, "getbuffer"):
+            # in memory (BytesIO), hash the rest of the buffer in place, in one call
+            with file_like.getbuffer() as buf, buf[file_like.tell():] as rest:
+                sha1.update(rest)
+            file_like.seek(0, 2)
+        elif hasattr(file_like, "readinto"):
+            # one reusable buffer, instead of a new bytes object per block
+            buf = bytearray(HASH_BLOCK_SIZE)
+            view = memoryview(buf)
+            size = file_like.readinto(buf)
+            while size:
+                sha1.update(view[:size])
+                size = file_like.readinto(buf)
+        else:
+            for c in iter(lambda: file_like.read(HASH_BLOCK_SIZE), b''):
+                sha1.update(c)
         return sha1.hexdigest()
 
     def _box_object_is_root(self, client: Client, box_object: BoxItem):
-        assert isinstance(client, Client)
+        # the root id is resolved at connect time, so this is a plain comparison
         if not box_object:
             return False
-        if box_object.object_type == 'file':
-            return False
-        if self.__root_id is None:
-            self.__root_id = client.root_folder().object_id
-        object_is_root = (box_object.object_id == self.__root_id)
-        return object_is_root
+        return box_object.object_type != 'file' and box_object.object_id == self.__root_id
 
     def _box_get_path(self, client: Client, box_object: BoxItem, use_cache=True) -> Optional[str]:
-        assert isinstance(client, Client)
         if self._box_object_is_root(client, box_object):
             return self.sep
         if use_cache:
             cached_path = self.__cache.get_path(box_object.object_id)
             if cached_path:
                 return cached_path
-        path_collection = None
-        if not hasattr(box_object, 'path_collection'):
-            box_object = self._unsafe_box_object_populate(client, box_object)
-        if hasattr(box_object, 'path_collection'):
+        try:
             path_collection = box_object.path_collection  # type: ignore
+        except AttributeError:
+            box_object = self._unsafe_box_object_populate(client, box_object)
+            path_collection = getattr(box_object, 'path_collection', None)
         if path_collection is not None:
             return self._get_path_from_collection(path_collection, box_object.name)  # type: ignore
         else:
@@ -605,17 +795,10 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             raise NotImplementedError("oid is %s" % (box_object.object_id, ))
 
     def _get_path_from_collection(self, path_collection: dict, base_name: str):
-        retval_list = []
-        entries = path_collection['entries']
-        for entry in entries:
-            if entry.id != '0':
-                retval_list.append(entry.name)
-        if base_name:
-            retval_list.append(base_name)
-        return self.join(retval_list)
+        # entries are sdk objects or raw json dicts, both support item access
+        return self.join((entry['name'] for entry in path_collection['entries'] if entry['id'] != '0'), base_name)
 
     def _box_get_dirinfo(self, client: Client, box_object: BoxItem, parent_path=None) -> Optional[DirInfo]:
-        assert isinstance(client, Client)
         oinfo = self._box_get_oinfo(client, box_object, parent_path)
         if not oinfo.path:
             oinfo.path = self._box_get_path(client, box_object)
@@ -629,6 +812,17 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
 
     @staticmethod
     def _parse_time(rfc3339_time_str):
+        # box sends offsets like "-07:00", or "Z", which fromisoformat parses far faster than arrow.
+        # anything without an offset still goes through arrow.
+        try:
+            iso_time_str = rfc3339_time_str
+            if iso_time_str.endswith('Z'):  # fromisoformat only takes "Z" from python 3.11
+                iso_time_str = iso_time_str[:-1] + '+00:00'
+            parsed = datetime.datetime.fromisoformat(iso_time_str)
+            if parsed.tzinfo is not None:
+                return parsed.timestamp()
+        except (AttributeError, TypeError, ValueError):
+            pass
         try:
             ret_val = arrow.get(rfc3339_time_str).float_timestamp
         except Exception as e:  # pragma: no cover
@@ -637,7 +831,6 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
         return ret_val
 
     def _box_get_oinfo(self, client: Client, box_object: BoxItem, parent_path=None, use_cache=True) -> Optional[OInfo]:
-        assert isinstance(client, Client)
         if box_object is None:
             return None
 
@@ -656,14 +849,8 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
                 path = self.__cache.get_path(box_object.object_id)  # type: ignore
             else:
                 path = None
-        return OInfo(
-            oid=box_object.object_id,  # type: ignore
-            path=path,
-            otype=obj_type,
-            hash=None if obj_type == DIRECTORY else box_object.sha1,  # type: ignore
-            size=size,
-            mtime=mtime
-        )
+        ohash = None if obj_type == DIRECTORY else box_object.sha1  # type: ignore
+        return OInfo(obj_type, box_object.object_id, ohash, path, size, mtime=mtime)  # type: ignore
 
     def _box_get_dirinfo_from_collection_entry(self, entry: dict, parent: str = None) -> Optional[DirInfo]:
         # This method is not used, but it is retained in a comment above for possible future use.
@@ -746,26 +933,66 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
         assert isinstance(client, Client)
         assert object_type is not None
         assert not strict or object_type in (FILE, DIRECTORY)
+        # a miss on a path usually means listing the whole parent folder, so misses are remembered briefly
+        key = ("oid", oid) if oid is not None else ("path", self.normalize_path(path))
+        if use_cache and self.__is_not_found(key):
+            return None
         try:
-            with self._api():  # just for exception translation inside the try
-                unsafe_box_object = self._unsafe_get_box_object(client, oid=oid, path=path, object_type=object_type, strict=strict, use_cache=use_cache)
-                retval = unsafe_box_object
-                return retval
+            try:
+                return self._unsafe_get_box_object(client, oid=oid, path=path, object_type=object_type, strict=strict, use_cache=use_cache)
+            except Exception as e:
+                # the caller already holds the guard, only the exception translation is needed here
+                self._BoxProviderGuard.translate(self, e)
+                raise
         except (CloudFileNotFoundError, PermissionError):  # PermissionError is raised on a non-existent OID
+            self.__remember_not_found(key)
             return None
 
-    def __look_for_name_in_collection_entries(self, client: Client, name, collection_entries, object_type, strict):
-        assert isinstance(client, Client)
+    # event polling reads and writes these without the api guard, so they take the mutex themselves
+    def __is_not_found(self, key: Tuple[str, str]) -> bool:
+        with self._mutex:
+            expires = self.__not_found.get(key)
+            if expires is None:
+                return False
+            if time.monotonic() < expires:
+                return True
+            self.__not_found.pop(key, None)
+            return False
+
+    def __remember_not_found(self, key: Tuple[str, str]):
+        if not self._not_found_ttl:
+            return
+        with self._mutex:
+            self.__not_found[key] = time.monotonic() + self._not_found_ttl
+            self.__not_found.move_to_end(key)
+            while len(self.__not_found) > self._not_found_max:
+                self.__not_found.popitem(last=False)
+
+    def __forget_not_found(self, oid: Optional[str], path: Optional[str]):
+        with self._mutex:
+            if not self.__not_found:
+                return
+            if oid is not None:
+                self.__not_found.pop(("oid", oid), None)
+            if path is not None:
+                self.__not_found.pop(("path", self.normalize_path(path)), None)
+
+    def __clear_not_found(self):
+        with self._mutex:
+            self.__not_found.clear()
+
+    @staticmethod
+    def __look_for_name_in_collection_entries(name, collection_entries, object_type, strict):
+        # returns the matching entry as listed, callers decide whether it needs fetching
         for entry in collection_entries:
             if entry.name == name:
                 found_type = DIRECTORY if entry.object_type == 'folder' else FILE
                 if object_type is not OType.NOTKNOWN and found_type != object_type and strict:
                     raise CloudFileExistsError()
-                return self._get_box_object(client, oid=entry.object_id, object_type=found_type, strict=strict), found_type
+                return entry, found_type
         return None, None
 
     def __box_get_metadata(self, client: Client, box_object: BoxItem, path=None):
-        assert isinstance(client, Client)
         path = path or self._box_get_path(client, box_object)
         parent = None
         if path:
@@ -788,12 +1015,12 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
         return None, None
 
     def _cache_collection_entries(self, client: Client, entries, parent_path):
+        # the client is checked once here, the per-entry helpers below don't repeat it
         assert isinstance(client, Client)
         for entry in entries:
             self.__box_cache_object(client, entry, self.join(parent_path, entry.name))
 
     def __box_cache_object(self, client: Client, box_object: BoxItem, path=None) -> Tuple[Optional[Dict], Optional[DirInfo]]:
-        assert isinstance(client, Client)
         if not box_object:  # this saves from having to check this condition everywhere
             if path:
                 self.__cache.delete(path=path)
@@ -806,13 +1033,19 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
         # clear the cache for the current oid, and return right away.
 
         self.__cache.update(path, otype, box_object.object_id, metadata, keep=True)
+        self.__forget_not_found(box_object.object_id, path)
 
         if hasattr(box_object, "item_collection"):  # has to be a folder
             assert len(box_object.item_collection.get('entries', [])) == 0 or path  # type: ignore
             for child in box_object.item_collection.get('entries', []):  # type: ignore
                 child_path = self.join(path, child.name)
                 child_otype = FILE if child.object_type == 'file' else DIRECTORY
-                self.__cache.update(child_path, child_otype, child.object_id, keep=True)
+                child_metadata = None
+                if 'size' in child and 'content_modified_at' in child:
+                    # fully listed child, its metadata is already here without another fetch
+                    child_metadata, _ = self.__box_get_metadata(client, child, child_path)
+                self.__cache.update(child_path, child_otype, child.object_id, child_metadata, keep=True)
+                self.__forget_not_found(child.object_id, child_path)
 
         return metadata, dir_info
 
@@ -825,8 +1058,7 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
     def _unsafe_get_box_object_from_path(self, client: Client,  # pylint: disable=too-many-locals
                                          path: str,
                                          object_type: OType,
-                                         strict: bool,
-                                         use_cache: bool) -> Optional[BoxItem]:
+                                         strict: bool) -> Optional[BoxItem]:
         assert isinstance(client, Client)
         assert object_type in (FILE, DIRECTORY)
         if path in ('/', ''):  # pragma: no cover
@@ -834,30 +1066,20 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             root: BoxItem = client.root_folder()
             root = self._unsafe_box_object_populate(client, root)
             return root
-        if use_cache:
-            cached_oid = self.__cache.get_oid(path)
-            if cached_oid:
-                cached_type = self.__cache.get_type(path=path) or NOTKNOWN
-                return self._get_box_object(client, oid=cached_oid, object_type=cached_type, strict=strict, use_cache=use_cache)
+        # _unsafe_get_box_object has already looked this path up in the cache, and does the same for the parent,
+        # so each uncached level costs one cache lookup, and records its oid on the way back
         parent, base = self.split(path)
-        cached_parent_oid = None
-        if use_cache:
-            cached_parent_oid = self.__cache.get_oid(parent)
-        parent_object: Union[None, BoxFolder, BoxItem]
-        if cached_parent_oid is not None:
-            parent_object = self._get_box_object(client, oid=cached_parent_oid, object_type=DIRECTORY, strict=strict)
-        else:
-            parent_object = self._get_box_object(client, path=parent, object_type=DIRECTORY, strict=strict)
-            if parent_object:
-                self.__cache.set_oid(parent, parent_object.object_id, DIRECTORY)
+        parent_object: Union[None, BoxFolder, BoxItem] = self._get_box_object(client, path=parent, object_type=DIRECTORY, strict=strict)
         if not parent_object:
             return None
         if parent_object.object_type != 'folder':
             raise CloudFileExistsError
         collection = parent_object.item_collection  # type: ignore
-        collection_entries = list(collection['entries'])
-        entry, found_type = self.__look_for_name_in_collection_entries(client, base, collection_entries, object_type,
-                                                                       strict)
+        entry, found_type = self.__look_for_name_in_collection_entries(base, collection['entries'], object_type, strict)
+        if entry:
+            # item_collection only holds mini entries (id, name, etag...), so fetch the full object
+            found_oid = entry.object_id
+            entry = self._get_box_object(client, oid=found_oid, object_type=found_type, strict=strict)
         if not entry:
             start = time.monotonic()
             # the next line is very slow for big folders.
@@ -866,12 +1088,19 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             # getting every item in the parent's folder? maybe limiting the fields would speed this up...
             entries = self._box_get_items(client, parent_object, parent)
             log.debug("done getting %s, %s", parent, time.monotonic() - start)
-            entry, found_type = self.__look_for_name_in_collection_entries(client, base, entries, object_type, strict)
+            # these were listed with _generic_fields, the same fields a fetch would populate, so files are used as is
+            entry, found_type = self.__look_for_name_in_collection_entries(base, entries, object_type, strict)
+            found_oid = entry.object_id if entry else None
+            if entry and found_type == DIRECTORY:
+                # but box leaves item_collection out of folder listings, and the next level of a path walk needs it
+                entry = self._get_box_object(client, oid=found_oid, object_type=found_type, strict=strict)
         if not entry:
             raise CloudFileNotFoundError()
         if strict and found_type != object_type:
             raise CloudFileExistsError()
-        return self._get_box_object(client, oid=entry.object_id, object_type=found_type, strict=strict)
+        # remember the listed oid, so the next lookup of this path skips the parent walk
+        self.__cache.set_oid(path, found_oid, found_type)
+        return entry
 
     def _unsafe_get_box_object_from_oid(self, client: Client, oid: str, object_type: OType, strict: bool) \
             -> Union[None, BoxItem, BoxFolder, BoxFile]:
@@ -901,10 +1130,12 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             box_object = client.folder(folder_id=oid)
         if object_type == DIRECTORY:
             box_object = client.file(file_id=oid)
-        box_object = self._unsafe_box_object_populate(client, box_object)  # should raise FNF if the object doesn't exists
-        if strict:  # if we are here, then the object exists and retval does not comply with "strict"
+        if strict:
+            # only existence matters here, so don't pull the full representation just to raise
+            box_object.get(fields=('name',))  # should raise FNF if the object doesn't exists
+            # if we are here, then the object exists and retval does not comply with "strict"
             raise CloudFileExistsError()
-        return box_object
+        return self._unsafe_box_object_populate(client, box_object)  # should raise FNF if the object doesn't exists
 
     def _unsafe_get_box_object(self, client: Client, oid: str = None, path: str = None, object_type: Optional[OType] = None,
                                strict=True, use_cache=True):
@@ -928,25 +1159,36 @@ class BoxProvider(Provider):  # pylint: disable=too-many-instance-attributes, to
             if oid is not None:
                 return self._unsafe_get_box_object_from_oid(client, oid, object_type, strict)  # no cache use, so no use_cache arg
             else:
-                return self._unsafe_get_box_object_from_path(client, path, object_type, strict, use_cache)
+                return self._unsafe_get_box_object_from_path(client, path, object_type, strict)
 
     def info_oid(self, oid: str, use_cache=True) -> Optional[OInfo]:
         with self._api() as client:
             box_object = self._get_box_object(client, oid=oid, object_type=NOTKNOWN, strict=False)  # todo: get type from cache
             oinfo = self._box_get_oinfo(client, box_object, use_cache=use_cache)
             if oinfo:
-                if not oinfo.path:
+                # the object was just fetched with its path_collection, which is free to use and fresher than the cache
+                path_collection = None
+                if not self._box_object_is_root(client, box_object):
+                    path_collection = getattr(box_object, 'path_collection', None)
+                if path_collection is not None:
+                    oinfo.path = self._get_path_from_collection(path_collection, box_object.name)  # type: ignore
+                elif not oinfo.path:
                     oinfo.path = self._box_get_path(client, box_object, use_cache=use_cache)
                 if box_object and oinfo.path:
                     self.__box_cache_object(client, box_object, oinfo.path)
             return oinfo
 
     def _clear_cache(self, *, oid=None, path=None):
-        if oid is None and path is None:
+        everything = oid is None and path is None
+        if everything:
             path = '/'
         self.__cache.delete(oid=oid, path=path)
-        self.__seen_events = {}
-        self.__event_sequence = {}
+        self.__clear_not_found()
+        if everything:
+            # event bookkeeping isn't tied to any path, so only a full clear resets it
+            # cleared in place, a running _short_poll holds a reference to it
+            self.__seen_events.clear()
+            self.__event_sequence = {}
         return True
 
     @classmethod
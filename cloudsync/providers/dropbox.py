@@ -42,6 +42,7 @@ logging.getLogger('requests').setLevel(logging.INFO)
 
 
 CACHE_QUOTA_TIME = 120
+CACHE_PARENT_TIME = 5
 
 
 # internal use errors
@@ -89,6 +90,7 @@ class DropboxProvider(Provider):
     upload_block_size = 10 * 1024 * 1024
     name = "dropbox"
     _redir = 'urn:ietf:wg:oauth:2.0:oob'
+    _parent_cache_ttl = CACHE_PARENT_TIME
 
     def __init__(self, oauth_config: Optional[OAuthConfig] = None):
         super().__init__()
@@ -377,6 +379,7 @@ class DropboxProvider(Provider):
         self._client = None
         self._longpoll_client = None
         self.__memoize_quota.clear()      # pylint: disable=no-member
+        self._forget_verified_parents()
 
     @property
     def latest_cursor(self):
@@ -428,6 +431,9 @@ class DropboxProvider(Provider):
                 continue
 
             if isinstance(res, files.DeletedMetadata):
+                # deleted by someone else, so delete() didn't get a chance to forget it
+                self._forget_verified_parents(res.path_lower)
+
                 # dropbox doesn't give you the id that was deleted
                 # we need to get the ids of every revision
                 # then find out which one was the latest before the deletion time
@@ -639,6 +645,8 @@ class DropboxProvider(Provider):
 
     def rename(self, oid, path):
         self._verify_parent_folder_exists(path)
+        # old path is unknown here, and any cached parent could be under it
+        self._forget_verified_parents()
         try:
             self._api('files_move_v2', oid, path)
         except CloudFileExistsError:
@@ -693,6 +701,7 @@ class DropboxProvider(Provider):
                 raise CloudFileExistsError("Cannot delete non-empty folder %s:%s" % (oid, info.path))
             except StopIteration:
                 pass  # Folder is empty, delete it no problem
+            self._forget_verified_parents(info.path)
         try:
             self._api('files_delete_v2', oid)
         except CloudFileNotFoundError:  # shouldn't happen because we are checking above...
@@ -701,6 +710,11 @@ class DropboxProvider(Provider):
     def exists_oid(self, oid) -> bool:
         return bool(self.info_oid(oid))
 
+    def _clear_cache(self, *, oid=None, path=None):
+        self._forget_verified_parents(path)
+        # the parent cache isn't a metadata cache, so don't claim to have one
+        return super()._clear_cache(oid=oid, path=path)
+
     def globalize_oid(self, oid):
         try:
             res = self._api('files_get_metadata', oid)
@@ -173,7 +173,9 @@ def canonicalize_tail(case_sensitive: bool, full_path: str) -> str:
 
 @dataclass
 class CacheEnt:
-    mtime = 0.0
+    mtime = 0
+    size = -1
+    ino = -1
     qhash = b''
     fhash = b''
 
@@ -454,7 +456,7 @@ class FileSystemProvider(Provider):                     # pylint: disable=too-ma
             self._latest_cursor += 1
             ev.new_cursor = self._latest_cursor
             self._events.append(ev)
-            assert self._events[ev.new_cursor - 1] is ev
+            assert self._events[ev.new_cursor - 1 - self._evoffset] is ev
             assert len(self._events) + self._evoffset == self._latest_cursor
 
     def events(self) -> typing.Generator[Event, None, None]:
@@ -494,8 +496,8 @@ class FileSystemProvider(Provider):                     # pylint: disable=too-ma
             with open(tmp_file, "wb") as f:
                 shutil.copyfileobj(file_like, f)
             try:
-                with open(tmp_file, "rb") as src, open(fpath, "wb") as dest:
-                    shutil.copyfileobj(src, dest)
+                # file to file, so the platform fast copy (sendfile etc) applies
+                shutil.copyfile(tmp_file, fpath)
             finally:
                 try:
                     os.unlink(tmp_file)
@@ -525,16 +527,19 @@ class FileSystemProvider(Provider):                     # pylint: disable=too-ma
         with open(path, "rb") as f:
             fhash, final = self._fast_hash_data(f)
 
-        # only update hash if modification time changes or if prefix bytes change
+        # only update hash if modification time, size or inode (file replaced) changes or if prefix bytes change
+        # the edge bytes are still checked because mtime isn't trusted, some vms and copy tools don't move it
         # this can be disabled
-        if not ci.qhash or st.st_mtime != ci.mtime or fhash != ci.fhash:
+        if not ci.qhash or (st.st_mtime_ns, st.st_size, st.st_ino) != (ci.mtime, ci.size, ci.ino) or fhash != ci.fhash:
             if final:
                 ci.qhash = fhash
             else:
                 with open(path, "rb") as f:
                     ci.qhash = get_hash(f)
             ci.fhash = fhash
-            ci.mtime = st.st_mtime
+            ci.mtime = st.st_mtime_ns
+            ci.size = st.st_size
+            ci.ino = st.st_ino
         return ci.qhash
 
     @staticmethod
@@ -4,7 +4,7 @@ import copy
 import logging
 import enum
 from hashlib import md5
-from typing import List, Any, Optional, Generator, Set
+from typing import List, Any, Optional, Generator, Set, Tuple
 from threading import RLock
 
 from cloudsync.event import Event
@@ -104,6 +104,8 @@ class MockFSObject:         # pylint: disable=too-few-public-methods
 
         self._hash_func = hash_func
         assert self._hash_func
+        # (contents, hash) of the last hash() call, contents are replaced rather than mutated on write
+        self._hashed: Tuple[Any, Any] = (None, None)
 
     @property
     def otype(self):
@@ -122,7 +124,11 @@ class MockFSObject:         # pylint: disable=too-few-public-methods
     def hash(self) -> Optional[str]:
         if self.type == self.DIR:
             return None
-        return self._hash_func(self.contents)
+        contents, value = self._hashed
+        if contents is not self.contents:
+            value = self._hash_func(self.contents)
+            self._hashed = (self.contents, value)
+        return value
 
     def update(self):
         self.mtime = time.time()
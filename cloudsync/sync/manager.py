@@ -513,32 +513,34 @@ class SyncManager(Runnable):
         """
         Called when it seems a file has changed.  Sticks the result in `sync[changed].temp_file`
         """
-        self.make_temp_file(sync[changed])
+        ss = sync[changed]
+        provider = self.providers[changed]
+        self.make_temp_file(ss)
 
-        assert sync[changed].oid
+        assert ss.oid
 
-        if os.path.exists(sync[changed].temp_file):
-            log.debug("%s reused %s temp", self.providers[changed], sync[changed].oid)
+        if os.path.exists(ss.temp_file):
+            log.debug("%s reused %s temp", provider, ss.oid)
             return True
 
         try:
-            partial_temp = sync[changed].temp_file + ".tmp"
-            log.debug("%s download %s to %s", self.providers[changed].name, sync[changed].oid, partial_temp)
+            partial_temp = ss.temp_file + ".tmp"
+            log.debug("%s download %s to %s", provider.name, ss.oid, partial_temp)
             with open(partial_temp, "wb") as f:
-                self.providers[changed].download(sync[changed].oid, f)
-            os.rename(partial_temp, sync[changed].temp_file)
+                provider.download(ss.oid, f)
+            os.rename(partial_temp, ss.temp_file)
             return True
         except FileNotFoundError:
-            log.warning("file not found %s", sync[changed].path)
-            sync[changed].clean_temp()
+            log.warning("file not found %s", ss.path)
+            ss.clean_temp()
             return False
         except PermissionError as e:
             raise ex.CloudTemporaryError("download or rename exception %s" % e)
 
         except ex.CloudFileNotFoundError:
             log.warning("download from %s failed fnf, switch to not exists",
-                      self.providers[changed].name)
-            sync[changed].exists = MISSING
+                      provider.name)
+            ss.exists = MISSING
             return False
 
     def get_folder_file_conflict(self, sync: SyncEntry, translated_path: str, synced: int) -> SyncEntry:
@@ -647,11 +649,12 @@ class SyncManager(Runnable):
         assert sync[changed].temp_file
 
         synced = OTHER_SIDE[changed]
+        provider = self.providers[synced]
         try:
-            temp_fh = open(sync[changed].temp_file, "rb")
-            info = self.providers[synced].upload(sync[synced].oid, temp_fh)
+            with open(sync[changed].temp_file, "rb") as temp_fh:
+                info = provider.upload(sync[synced].oid, temp_fh)
             log.debug("upload to %s as path %s",
-                      self.providers[synced].name, sync[synced].sync_path)
+                      provider.name, sync[synced].sync_path)
 
             sync[synced].hash = info.hash
             sync[synced].sync_hash = info.hash
@@ -667,7 +670,7 @@ class SyncManager(Runnable):
             log.warning("FNF during upload %s:%s", sync[synced].sync_path, sync[changed].temp_file)
             return False
         except ex.CloudFileNotFoundError:
-            info = self.providers[synced].info_oid(sync[synced].oid)
+            info = provider.info_oid(sync[synced].oid)
 
             if not info:
                 log.info("convert to missing")
@@ -691,9 +694,6 @@ class SyncManager(Runnable):
             # Nothing else to sync
             self.handle_file_name_error(sync, synced, sync[synced].path)
             return True
-        finally:
-            if temp_fh:
-                temp_fh.close()
 
     def _create_synced(self, changed, sync, translated_path):
         synced = OTHER_SIDE[changed]
@@ -1440,7 +1440,8 @@ class SyncManager(Runnable):
                     sync.ignore(IgnoreReason.IRRELEVANT)
 
         if sync.is_discarded:
-            log.log(TRACE, "%s Ignoring entry because %s:%s", debug_sig(id(self)), sync.ignored.value, sync)
+            if log.isEnabledFor(TRACE):
+                log.log(TRACE, "%s Ignoring entry because %s:%s", debug_sig(id(self)), sync.ignored.value, sync)
             return FINISHED
 
         if sync.is_conflicted:
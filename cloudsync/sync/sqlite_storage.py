@@ -1,7 +1,8 @@
 from typing import Dict, Any, Optional, overload
 import logging
 import sqlite3
-from threading import Lock
+from contextlib import contextmanager
+from threading import RLock
 from .state import Storage
 
 log = logging.getLogger(__name__)
@@ -12,8 +13,9 @@ class SqliteStorage(Storage):
     Local disk storage using sqlite.
     """
     def __init__(self, filename: str):
-        self._mutex = Lock()
+        self._mutex = RLock()
         self._filename = filename
+        self._in_transaction = False
         self.db = None
         self.db = self.__db_connect()
         self._ensure_table_exists()
@@ -37,6 +39,10 @@ class SqliteStorage(Storage):
             try:
                 retval = self.db.execute(sql, parameters)
             except sqlite3.OperationalError:
+                if self._in_transaction:
+                    # reconnecting would silently drop the writes already made in this transaction
+                    # sqlite may have rolled it back already, so db.in_transaction can't be trusted here
+                    raise
                 self.__db_connect()  # reconnect
                 retval = self.db.execute(sql, parameters)
             return retval
@@ -73,6 +79,29 @@ class SqliteStorage(Storage):
             log.debug("ignoring delete: id %s doesn't exist", eid)
             return
 
+    @contextmanager
+    def transaction(self):
+        # one commit (and one WAL sync) for the whole block instead of one per statement
+        # holding the mutex keeps other threads' statements out of this transaction
+        # if the block raises, none of its writes are kept
+        with self._mutex:
+            if self._in_transaction:
+                yield
+                return
+            self.__db_execute("BEGIN")
+            self._in_transaction = True
+            try:
+                yield
+                self.db.execute("COMMIT")
+            except BaseException:
+                # sqlite may already have rolled back on its own (disk full, i/o error)
+                # a failed COMMIT leaves it open, and later autocommit writes would land in it
+                if self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+                raise
+            finally:
+                self._in_transaction = False
+
     @overload
     def read_all(self) -> Dict[str, Dict[Any, bytes]]:
         ...
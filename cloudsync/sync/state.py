@@ -8,10 +8,12 @@ altered to independent, and not paired at all.
 """
 
 import copy
+import hashlib
 import logging
 import time
 import os
 import random
+from contextlib import contextmanager
 from threading import RLock
 from abc import ABC, abstractmethod
 from enum import Enum
@@ -34,6 +36,12 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 OTHER_SIDE = (1, 0)
 
+
+def _storage_digest(ser: bytes) -> bytes:
+    # a real digest, python's hash() collides too easily to prove two serializations are the same
+    return hashlib.blake2b(ser, digest_size=16).digest()
+
+
 __all__ = ['SyncState', 'SideState', 'SyncStateLookup', 'SyncEntry', 'Storage',
            'FILE', 'DIRECTORY', 'UNKNOWN', 'MISSING', 'TRASHED', 'EXISTS', 'LIKELY_TRASHED', 'OTHER_SIDE', 'CORRUPT']
 # safe ternary, don't allow traditional comparisons
@@ -66,11 +74,14 @@ CORRUPT = Exists.CORRUPT
 
 
 # state of a single object
-@strict         # pylint: disable=too-many-instance-attributes
-class SideState:
+class SideState:  # pylint: disable=too-many-instance-attributes
     """
     One half of a sync
     """
+    # not @strict: pystrict needs an instance __dict__, and slots already refuse undeclared attributes
+    __slots__ = ('_parent', '_side', '_otype', '_hash', '_changed', '_last_gotten', '_sync_hash', '_sync_path',
+                 '_path', '_oid', '_exists', '_force_sync', '_temp_file', '_size', '_mtime', '_saved_exists')
+
     hash: Any
     sync_hash: Any
 
@@ -178,8 +189,7 @@ class SideState:
         self.mtime = None
 
     def __repr__(self):
-        d = self.__dict__.copy()
-        d.pop("_parent", None)
+        d = {k: getattr(self, k) for k in self.__slots__ if k != "_parent" and hasattr(self, k)}
         return self.__class__.__name__ + ":" + debug_sig(id(self)) + str(d)
 
     def needs_sync(self):
@@ -230,43 +240,40 @@ class SideState:
         return self.is_corrupt and self._saved_exists in (TRASHED, MISSING, LIKELY_TRASHED)
 
     def serialize(self) -> dict:
-        ret = dict()
-        ret['otype'] = self.otype.value
-        ret['side'] = self.side
-        ret['hash'] = self.hash
-        ret['changed'] = self.changed
-        ret['sync_hash'] = self.sync_hash
-        ret['path'] = self.path
-        ret['sync_path'] = self.sync_path
-        ret['oid'] = self.oid
-        ret['exists'] = self.exists.value
-        ret['temp_file'] = self.temp_file
-        ret['size'] = self.size
-        ret['mtime'] = self.mtime
-        ret['_saved_exists'] = None if self._saved_exists is None else self._saved_exists.value
         # storage_id does not get serialized, it always comes WITH a serialization when deserializing
-        return ret
+        # reads the underscored fields directly, each public name would be a __getattr__ fallback
+        return {
+            'otype': self._otype.value,
+            'side': self._side,
+            'hash': self._hash,
+            'changed': self._changed,
+            'sync_hash': self._sync_hash,
+            'path': self._path,
+            'sync_path': self._sync_path,
+            'oid': self._oid,
+            'exists': self._exists.value,
+            'temp_file': self._temp_file,
+            'size': self._size,
+            'mtime': self._mtime,
+            '_saved_exists': None if self._saved_exists is None else self._saved_exists.value,
+        }
 
     def deserialize(self, serialization: dict):
-        self.otype = OType(serialization['otype'])
-        self.side = serialization['side']
-        self.hash = serialization['hash']
-        self.changed = serialization['changed']
-        self.sync_hash = serialization['sync_hash']
-        self.sync_path = serialization['sync_path']
-        self.oid = serialization['oid']
-        self.path = serialization['path']
-        # back compat: 10/21/19
-        if serialization['exists'] is None:
-            self.exists = UNKNOWN
-        if serialization['exists'] is True:
-            self.exists = EXISTS
-        if serialization['exists'] is False:
-            self.exists = TRASHED
-        self.exists = serialization['exists']
-        self.temp_file = serialization['temp_file']
-        self.size = serialization.get('size')
-        self.mtime = serialization.get('mtime')
+        # only called while the state is loading, when it ignores updates anyway,
+        # so the fields are set directly instead of through __setattr__ and the update hooks
+        self._otype = OType(serialization['otype'])
+        self._side = serialization['side']
+        self._hash = serialization['hash']
+        self._changed = serialization['changed']
+        self._sync_hash = serialization['sync_hash']
+        self._sync_path = serialization['sync_path']
+        self._oid = serialization['oid']
+        self._path = serialization['path']
+        # back compat: 10/21/19, exists was stored as None/True/False
+        self._exists = self._translate_exists(serialization['exists'])
+        self._temp_file = serialization['temp_file']
+        self._size = serialization.get('size')
+        self._mtime = serialization.get('mtime')
         saved_exists = serialization.get('_saved_exists')
         try:
             self._saved_exists = Exists(saved_exists) if saved_exists else None
@@ -321,13 +328,23 @@ class Storage(ABC):
         """return one serialized string or None"""
         ...
 
+    @contextmanager
+    def transaction(self):
+        """
+        group the writes made inside the block
+
+        transactional storages drop all of the block's writes if it raises, others just write through
+        """
+        yield
+
 
 # single entry in the syncs state collection
-@strict         # pylint: disable=too-many-instance-attributes, too-many-public-methods
-class SyncEntry:
+class SyncEntry:  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """
     A pair of side states, as well as their storage information, and sync priority.
     """
+    __slots__ = ('_SyncEntry__states', '_ignored', '_storage_id', '_storage_sig', '_priority', '_parent')
+
     def __init__(self, parent: 'SyncState',
                  otype: Optional[OType],
                  storage_init: Optional[Tuple[Any, bytes]] = None,
@@ -337,13 +354,15 @@ class SyncEntry:
         self.__states: List[SideState] = [SideState(self, 0, otype), SideState(self, 1, otype)]
         self._ignored = ignore_reason
         self._storage_id: Any = None
+        self._storage_sig: Optional[bytes] = None  # digest of the serialization last read from or written to storage
         self._priority: float = 0         # 0 == normal, > 0 == high, < 0 == low
         self._parent = parent
 
         if storage_init is not None:
             self._storage_id = storage_init[0]
             self.deserialize(storage_init)
-        log.debug("new syncent %s", debug_sig(id(self)))
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("new syncent %s", debug_sig(id(self)))
 
         self.priority: float
 
@@ -368,12 +387,13 @@ class SyncEntry:
         self._parent.updated(self, side, key, val)
 
     def serialize(self) -> bytes:
-        """converts SyncEntry into a json str"""
-        ser: Dict[str, Any] = dict()
-        ser['side0'] = self.__states[0].serialize()
-        ser['side1'] = self.__states[1].serialize()
-        ser['ignored'] = self._ignored.value
-        ser['priority'] = self._priority
+        """converts SyncEntry into msgpack bytes"""
+        ser: Dict[str, Any] = {
+            'side0': self.__states[0].serialize(),
+            'side1': self.__states[1].serialize(),
+            'ignored': self._ignored.value,
+            'priority': self._priority,
+        }
         try:
             return msgpack.dumps(ser, use_bin_type=True)
         except TypeError:
@@ -383,6 +403,7 @@ class SyncEntry:
     def deserialize(self, storage_init: Tuple[Any, bytes]):
         """loads the values in the serialization dict into self"""
         self.storage_id = storage_init[0]
+        self._storage_sig = _storage_digest(storage_init[1])
         ser: dict = msgpack.loads(storage_init[1], use_list=False, raw=False)
         self.__states[0].deserialize(ser['side0'])
         self.__states[1].deserialize(ser['side1'])
@@ -437,8 +458,9 @@ class SyncEntry:
         self.__states[side] = copy.copy(val)
 
     def hash_conflict(self):
-        if self[0].hash and self[1].hash and self[0].path and self[1].path:
-            return self[0].hash != self[0].sync_hash and self[1].hash != self[1].sync_hash
+        s0, s1 = self.__states
+        if s0._hash and s1._hash and s0._path and s1._path:
+            return s0._hash != s0._sync_hash and s1._hash != s1._sync_hash
         return False
 
     def is_path_change(self, changed):
@@ -729,13 +751,12 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
             for eid, ent_ser in storage_dict.items():
                 try:
                     ent = SyncEntry(self, None, (eid, ent_ser))
-                    for side in [LOCAL, REMOTE]:
-                        path, oid = ent[side].path, ent[side].oid
-                        if path not in self._paths[side]:
-                            self._paths[side][path] = {}
-                        self._paths[side][path][oid] = ent
+                    for side in (LOCAL, REMOTE):
+                        side_state = ent[side]
+                        oid = side_state._oid
+                        self._paths[side].setdefault(side_state._path, {})[oid] = ent
                         self._oids[side][oid] = ent
-                        if ent[side].changed:
+                        if side_state._changed:
                             self._changeset_storage.add(ent)
                 except Exception as e:
                     log.error("exception during deserialization %s", e)
@@ -756,7 +777,15 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
     def forget_oid(self, side, oid):
         ent = self._oids[side].pop(oid, None)
         if ent:
-            self._paths[side][ent[side].path].pop(oid)
+            self._forget_path(side, ent[side].path, oid)
+
+    def _forget_path(self, side, path, oid):
+        paths = self._paths[side]
+        path_ents = paths.get(path)
+        if path_ents is not None:
+            path_ents.pop(oid, None)
+            if not path_ents:
+                del paths[path]
 
     def forget(self):
         self._oids = ({}, {})
@@ -819,24 +848,19 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
         if prior_path == path:
             return
 
-        if prior_path and prior_path in self._paths[side]:
-            prior_ent = self._paths[side][prior_path].pop(ent[side].oid, None)
-            if not self._paths[side][prior_path]:
-                del self._paths[side][prior_path]
-            prior_ent = None
+        oid = ent[side].oid
+        if prior_path:
+            self._forget_path(side, prior_path, oid)
 
         if path:
-            if path not in self._paths[side]:
-                self._paths[side][path] = {}
-
-            path_ents = self._paths[side][path]
-            if ent[side].oid in path_ents:
-                prior_ent = path_ents[ent[side].oid]
+            path_ents = self._paths[side].setdefault(path, {})
+            prior_ent = path_ents.get(oid)
+            if prior_ent is not None:
                 assert prior_ent is not ent
                 # ousted this ent
                 prior_ent[side]._path = None
 
-            self._paths[side][path][ent[side].oid] = ent
+            path_ents[oid] = ent
             ent[side]._path = path
 
             self._update_kids(ent, side, prior_path, path, provider)
@@ -881,11 +905,7 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
 
             if prior_ent:
                 if prior_ent[side].path:
-                    prior_path = prior_ent[side].path
-                    if prior_path in self._paths[side]:
-                        self._paths[side][prior_path].pop(remove_oid, None)
-                        if not self._paths[side][prior_path]:
-                            del self._paths[side][prior_path]
+                    self._forget_path(side, prior_ent[side].path, remove_oid)
 
                 if prior_ent is not ent:
                     # no longer indexed by oid, also clear change bit
@@ -898,9 +918,7 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
             assert self.lookup_oid(side, oid) is ent
 
         if oid is not None and ent[side].path:
-            if ent[side].path not in self._paths[side]:
-                self._paths[side][ent[side].path] = {}
-            self._paths[side][ent[side].path][oid] = ent
+            self._paths[side].setdefault(ent[side].path, {})[oid] = ent
 
         if oid is not None:
             # ent with oid goes in changeset
@@ -944,33 +962,25 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
             return None
 
     def lookup_path(self, side, path, stale=False) -> List[SyncEntry]:
-        try:
-            ret: Sequence[SyncEntry] = list(self._paths[side][path].values())
-            if ret:
-                return [e for e in ret if stale or (not e.is_discarded and not e.is_conflicted)]
-            return []
-        except KeyError:
+        path_ents = self._paths[side].get(path)
+        if not path_ents:
             return []
+        if stale:
+            return list(path_ents.values())
+        return [e for e in path_ents.values() if not e.is_discarded and not e.is_conflicted]
 
     def rename_dir(self, side, from_dir, to_dir, is_subpath, replace_path):
         """
         when a directory changes, utility to rename all kids
         """
-        remove = []
-
-        # TODO: refactor this so that a list of affected items is gathered, then the alterations happen to the final
-        #    list, which will avoid having to remove after adding, which feels mildly risky
         # TODO: is this function called anywhere? ATM, it looks like no... It should be called or removed
-        for path, oid_dict in self._paths[side].items():
-            if is_subpath(from_dir, path):
-                new_path = replace_path(path, from_dir, to_dir)
-                remove.append(path)
-                self._paths[side][new_path] = oid_dict
-                for ent in oid_dict.values():
-                    ent[side].path = new_path
+        # gather first: setting the path re-indexes the entry, which alters self._paths
+        moves = [(ent, replace_path(path, from_dir, to_dir))
+                 for path, oid_dict in self._paths[side].items() if is_subpath(from_dir, path)
+                 for ent in oid_dict.values()]
 
-        for path in remove:
-            self._paths[side].pop(path)
+        for ent, new_path in moves:
+            ent[side].path = new_path
 
     def update_entry(self, ent, side, oid, *, path=None, file_hash=None, exists=True, changed=False, otype=None, size=None, mtime=None, accurate=False):  # pylint: disable=redefined-builtin, too-many-arguments, too-many-branches
         assert ent
@@ -1087,10 +1097,37 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
 
     def storage_commit(self):
         self.pretty_log_state_table_diffs()
-        for ent in self._dirtyset:
-            self._storage_update(ent)
+        if self._dirtyset and self._storage is not None and self._tag is not None:
+            created: List[SyncEntry] = []
+            try:
+                with self._storage.transaction():
+                    for ent in self._dirtyset:
+                        if ent.storage_id is None:
+                            created.append(ent)
+                        self._storage_update(ent)
+            except BaseException:
+                self._storage_batch_failed(created)
+                raise
         self._dirtyset.clear()
 
+    def _storage_batch_failed(self, created: List[SyncEntry]):
+        # the storage may or may not have kept the batch, so don't trust what _storage_update recorded
+        # the entries are still dirty, the next commit writes them all again
+        storage = cast(Storage, self._storage)
+        tag = cast(str, self._tag)
+        for ent in self._dirtyset:
+            ent._storage_sig = None
+        for ent in created:
+            if ent._storage_id is None:
+                continue
+            try:
+                kept = storage.read(tag, ent._storage_id) is not None
+            except Exception:
+                log.exception("can't tell if eid%s was stored", ent._storage_id)
+                continue
+            if not kept:
+                ent._storage_id = None
+
     def _storage_update(self, ent: SyncEntry):
         if self._tag is None:
             return
@@ -1101,12 +1138,20 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
             if ent.storage_id is not None:
                 if ent.is_trash:
                     self._storage.delete(tag, ent.storage_id)
+                    ent._storage_sig = None
                 else:
-                    self._storage.update(tag, ent.serialize(), ent.storage_id)
+                    ser = ent.serialize()
+                    sig = _storage_digest(ser)
+                    # entries are marked dirty by any assignment, skip the write if nothing stored actually changed
+                    if sig != ent._storage_sig:
+                        self._storage.update(tag, ser, ent.storage_id)
+                        ent._storage_sig = sig
             else:
                 if ent.is_trash:
                     return
-                new_id = self._storage.create(tag, ent.serialize())
+                ser = ent.serialize()
+                new_id = self._storage.create(tag, ser)
+                ent._storage_sig = _storage_digest(ser)
                 ent.storage_id = new_id
                 log.debug("storage_update creating eid%s", ent.storage_id)
 
@@ -1116,7 +1161,8 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
     def update(self, side, otype, oid, path=None, hash=None, exists=True, prior_oid=None, size=None, mtime=None, accurate=False):   # pylint: disable=redefined-builtin, too-many-arguments, disable=too-many-locals
         """Called by the event manager when an event happens."""
 
-        log.log(TRACE, "lookup oid %s, sig %s", oid, debug_sig(oid))
+        if log.isEnabledFor(TRACE):
+            log.log(TRACE, "lookup oid %s, sig %s", oid, debug_sig(oid))
         ent: SyncEntry = self.lookup_oid(side, oid)
 
         prior_ent = None
@@ -1187,19 +1233,15 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
         if self.shuffle:
             sort_key = lambda a: (a.priority, random.random())
 
-        changes = sorted(change_set, key=sort_key)
-
         now = time.time()
         earlier_than = now - age
-        for e in changes:
-            if (e[LOCAL].changed and (e[LOCAL].changed <= earlier_than)) \
-                    or (e[REMOTE].changed and (e[REMOTE].changed <= earlier_than)) \
-                    or e.priority < 0:
-                return e
-            # else:
-            #     log.debug("HERE now=%s age=%s earlier_than=%s changed=%s:%s %s", now, age, earlier_than, e[LOCAL].changed, e[REMOTE].changed, e)
-
-        return None
+        aged = (e for e in change_set
+                if (e[LOCAL].changed and (e[LOCAL].changed <= earlier_than))
+                or (e[REMOTE].changed and (e[REMOTE].changed <= earlier_than))
+                or e.priority < 0)
+        # only the first aged entry in sort order is wanted, so one pass instead of sorting the whole changeset.
+        # like sorted(), min() keeps the first of equal keys
+        return min(aged, key=sort_key, default=None)
 
     def finished(self, ent: SyncEntry):
         if not ent[0].changed:
@@ -1237,7 +1279,7 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
         return 1
 
     def pretty_print(self, use_sigs=True, only_dirty=False):
-        ents: List[SyncEntry] = list()
+        ents: List[Tuple[SyncEntry, tuple]] = list()
         widths: List[int] = [len(x) for x in SyncState.headers]
         if only_dirty:
             all_ents = self._dirtyset.copy()
@@ -1246,8 +1288,9 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
 
         e: SyncEntry
         for e in all_ents:
-            ents.append(e)
-            for i, val in enumerate(e.pretty_summary(use_sigs=use_sigs)):
+            summary = e.pretty_summary(use_sigs=use_sigs)
+            ents.append((e, summary))
+            for i, val in enumerate(summary):
                 width = len(str(val))
                 if width > widths[i]:
                     widths[i] = width
@@ -1258,12 +1301,12 @@ class SyncState:  # pylint: disable=too-many-instance-attributes, too-many-publi
 
         ret = SyncState.pretty_headers(widths=widths) + "\n"
         found_ignored = False
-        for e in sorted(ents, key=self.pretty_sort_key):
+        for e, summary in sorted(ents, key=lambda pair: self.pretty_sort_key(pair[0])):
             if e.ignored != IgnoreReason.NONE and not found_ignored:
                 if not only_dirty:
                     ret += "------\n"
                 found_ignored = True
-            ret += e.pretty(widths=widths, use_sigs=use_sigs) + "\n"
+            ret += e.pretty(widths=widths, summary=summary) + "\n"
 
         return ret
 
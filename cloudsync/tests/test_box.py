@@ -1,13 +1,17 @@
 import os
 import io
+import copy
+import hashlib
 import threading
 import logging
+import urllib.parse
 from typing import Dict, List
 from unittest.mock import patch
 
 import pytest
 
-from cloudsync.exceptions import CloudTokenError
+from cloudsync import FILE, DIRECTORY
+from cloudsync.exceptions import CloudTokenError, CloudFileExistsError
 from cloudsync.providers import BoxProvider
 from cloudsync.oauth import OAuthConfig, OAuthProviderInfo
 from cloudsync.oauth.apiserver import ApiServer, ApiError, api_route
@@ -18,6 +22,10 @@ log = logging.getLogger(__name__)
 
 
 class FakeBoxApi(FakeApi):
+    bare_events = 0  # number of events, per poll, whose source has no path_collection
+    bare_links = 0  # number of web link events, per poll, whose source has no path_collection
+    upload_conflict = False  # uploads fail as if another client just created the same name
+
     @api_route("/users/me")
     def upload(self, ctx, req):
         self.called("users/me", (ctx, req))
@@ -39,8 +47,134 @@ class FakeBoxApi(FakeApi):
                 'timezone': 'America/Los_Angeles',
                 'type': 'user'}
 
+    @api_route("/events")
+    def events(self, ctx, req):
+        if ctx.get("REQUEST_METHOD") == "OPTIONS":
+            self.called("realtime_servers", (ctx, req))
+            return {'chunk_size': 1, 'entries': [{'type': 'realtime_server', 'url': self.uri() + 'realtime',
+                                                  'ttl': '10', 'max_retries': '2', 'retry_timeout': 610}]}
+        self.called("events", (ctx, req))
+        return {'chunk_size': 3,
+                'next_stream_position': 1000 + len(self.calls["events"]),
+                'entries': [{'type': 'event',
+                             'event_id': 'ev-%s-%s' % (len(self.calls["events"]), i),
+                             'event_type': 'ITEM_CREATE',
+                             'created_at': '2019-12-12T06:48:48-08:00',
+                             'source': {'type': 'user', 'id': '8506151483'}}
+                            for i in range(3)] + [
+                    {'type': 'event',
+                     'event_id': 'preview-%s' % len(self.calls["events"]),
+                     'event_type': 'ITEM_PREVIEW',
+                     'created_at': '2019-12-12T06:48:48-08:00',
+                     'source': {'type': 'file', 'id': '555', 'name': 'f.txt'}},
+                    {'type': 'event',
+                     'event_id': 'file-%s' % len(self.calls["events"]),
+                     'event_type': 'ITEM_UPLOAD',
+                     'created_at': '2019-12-12T06:48:48-08:00',
+                     'source': {'type': 'file', 'id': '555', 'name': 'f.txt', 'sha1': 'abc',
+                                'sequence_id': '0', 'item_status': 'active',
+                                'path_collection': {'total_count': 2, 'entries': [
+                                    {'type': 'folder', 'id': '0', 'name': 'All Files'},
+                                    {'type': 'folder', 'id': '77', 'name': 'sub'}]}}}] + [
+                    {'type': 'event',
+                     'event_id': 'bare-%s-%s' % (len(self.calls["events"]), i),
+                     'event_type': 'ITEM_MODIFY',
+                     'created_at': '2019-12-12T06:48:48-08:00',
+                     'source': {'type': 'file', 'id': '556', 'name': 'g.txt', 'sha1': 'def',
+                                'sequence_id': '0', 'item_status': 'active'}}
+                    for i in range(self.bare_events)] + [
+                    {'type': 'event',
+                     'event_id': 'link-%s-%s' % (len(self.calls["events"]), i),
+                     'event_type': 'ITEM_CREATE',
+                     'created_at': '2019-12-12T06:48:48-08:00',
+                     'source': {'type': 'web_link', 'id': '557', 'name': 'link.url',
+                                'sequence_id': '0', 'item_status': 'active'}}
+                    for i in range(self.bare_links)]}
+
+    @api_route("/realtime")
+    def realtime(self, ctx, req):
+        self.called("realtime", (ctx, req))
+        return {'message': 'reconnect'}
+
+    @api_route("/files/556")
+    def file_556(self, ctx, req):
+        self.called("files/556", (ctx, req))
+        return {'type': 'file', 'id': '556', 'name': 'g.txt', 'sha1': 'def', 'sequence_id': '0', 'item_status': 'active',
+                'path_collection': {'total_count': 1, 'entries': [{'type': 'folder', 'id': '0', 'name': 'All Files'}]}}
+
+    @api_route("/web_links/557")
+    def web_link_557(self, ctx, req):
+        self.called("web_links/557", (ctx, req))
+        return {'type': 'web_link', 'id': '557', 'name': 'link.url', 'url': 'https://example.com', 'sequence_id': '0',
+                'item_status': 'active',
+                'path_collection': {'total_count': 2, 'entries': [
+                    {'type': 'folder', 'id': '0', 'name': 'All Files'},
+                    {'type': 'folder', 'id': '77', 'name': 'sub'}]}}
+
+    @api_route("/folders/300")
+    def big_folder(self, ctx, req):
+        # like box, item_collection only holds the first 100 children, as mini entries
+        self.called("folders/300", (ctx, req))
+        return {'type': 'folder', 'id': '300', 'name': 'wide', 'content_modified_at': '2019-12-12T06:48:48-08:00',
+                'path_collection': {'total_count': 1, 'entries': [{'type': 'folder', 'id': '0', 'name': 'All Files'}]},
+                'item_collection': {'total_count': 150, 'entries': [
+                    {'type': 'folder', 'id': str(1000 + i), 'name': 'd%s' % i} for i in range(100)]}}
+
+    @api_route("/folders/300/items")
+    def big_folder_children(self, ctx, req):
+        # listed children are full entries, but folders never carry an item_collection here
+        self.called("folders/300/items", (ctx, req))
+        query = urllib.parse.parse_qs(ctx["QUERY_STRING"])
+        offset, limit = int(query["offset"][0]), int(query["limit"][0])
+        entries = [{'type': 'folder', 'id': str(1000 + i), 'name': 'd%s' % i,
+                    'content_modified_at': '2019-12-12T06:48:48-08:00'} for i in range(150)]
+        return {'entries': entries[offset:offset + limit], 'limit': limit, 'offset': offset, 'total_count': 150}
+
+    @api_route("/folders/1120")
+    def big_folder_child(self, ctx, req):
+        self.called("folders/1120", (ctx, req))
+        return {'type': 'folder', 'id': '1120', 'name': 'd120', 'content_modified_at': '2019-12-12T06:48:48-08:00',
+                'path_collection': {'total_count': 2, 'entries': [{'type': 'folder', 'id': '0', 'name': 'All Files'},
+                                                                  {'type': 'folder', 'id': '300', 'name': 'wide'}]},
+                'item_collection': {'total_count': 1, 'entries': [{'type': 'file', 'id': '421', 'name': 'leaf'}]}}
+
+    @api_route("/files/421")
+    def big_folder_leaf(self, ctx, req):
+        self.called("files/421", (ctx, req))
+        return {'type': 'file', 'id': '421', 'name': 'leaf', 'sha1': 'abc', 'size': 3,
+                'content_modified_at': '2019-12-12T06:48:48-08:00',
+                'path_collection': {'total_count': 3, 'entries': [{'type': 'folder', 'id': '0', 'name': 'All Files'},
+                                                                  {'type': 'folder', 'id': '300', 'name': 'wide'},
+                                                                  {'type': 'folder', 'id': '1120', 'name': 'd120'}]}}
+
+    @api_route("/files/404")
+    def file_404(self, ctx, req):
+        self.called("files/404", (ctx, req))
+        raise ApiError(404, json={'type': 'error', 'status': 404, 'code': 'not_found', 'message': 'Not Found'})
+
+    @api_route("/folders/404")
+    def folder_404(self, ctx, req):
+        self.called("folders/404", (ctx, req))
+        raise ApiError(404, json={'type': 'error', 'status': 404, 'code': 'not_found', 'message': 'Not Found'})
+
+    @api_route("/folders/88/items")
+    def big_folder_items(self, ctx, req):
+        # 5 children, and like box, caps the page size (at 2 here)
+        self.called("folders/88/items", (ctx, req))
+        query = urllib.parse.parse_qs(ctx["QUERY_STRING"])
+        limit = min(int(query["limit"][0]), 2)
+        entries = [{'type': 'file', 'id': str(900 + i), 'name': 'f%s' % i, 'sha1': 'abc', 'size': 3,
+                    'content_modified_at': '2019-12-12T06:48:48-08:00'} for i in range(5)]
+        if "useMarker" in query:
+            marker = int(query.get("marker", ["0"])[0])
+            next_marker = str(marker + limit) if marker + limit < len(entries) else None
+            return {'entries': entries[marker:marker + limit], 'limit': limit, 'next_marker': next_marker}
+        offset = int(query["offset"][0])
+        return {'entries': entries[offset:offset + limit], 'limit': limit, 'offset': offset, 'total_count': 5}
+
     @api_route("/folders/0/items")
     def folder_items(self, ctx, req):
+        self.called("folders/0/items", (ctx, req))
         return {
             'entries':
             [{'etag': '0',
@@ -163,6 +297,8 @@ class FakeBoxApi(FakeApi):
     @api_route("/upload/files/")
     def upload_files(self, ctx, req):
         self.called("upload/files", (ctx, req))
+        if self.upload_conflict:
+            raise ApiError(409, json={'type': 'error', 'status': 409, 'code': 'item_name_in_use', 'message': 'Item with the same name already exists'})
         return {'entries': [{'content_created_at': '2019-12-12T05:13:57-08:00',
             'content_modified_at': '2019-12-12T05:13:57-08:00',
             'created_at': '2019-12-12T05:13:57-08:00',
@@ -251,3 +387,251 @@ def test_nocred():
         prov.disconnect()
         prov.connect(None)
 
+
+
+def test_hash_data():
+    prov = BoxProvider()
+    data = os.urandom(600 * 1024)
+    expected = hashlib.sha1(data).hexdigest()
+    assert prov.hash_data(io.BytesIO(data)) == expected
+
+    partial = io.BytesIO(data)
+    partial.seek(1000)
+    assert prov.hash_data(partial) == hashlib.sha1(data[1000:]).hexdigest()
+    assert partial.tell() == len(data)
+    partial.write(b"still writable")
+
+    with open(__file__, "rb") as f:
+        assert prov.hash_data(f) == hashlib.sha1(open(__file__, "rb").read()).hexdigest()
+
+    class ReadOnly:
+        def __init__(self, data):
+            self.__io = io.BytesIO(data)
+
+        def read(self, size=-1):
+            return self.__io.read(size)
+
+    assert prov.hash_data(ReadOnly(data)) == expected
+
+
+def test_seen_events_bounded():
+    srv, prov = fake_prov()
+    prov._seen_events_max = 4
+    prov.current_cursor = 1
+    for _ in range(3):
+        list(prov._short_poll())
+    seen = prov._BoxProvider__seen_events
+    assert list(seen) == ["ev-3-0", "ev-3-1", "ev-3-2", "file-3"]
+    prov.disconnect()
+
+
+def test_short_poll_raw_events():
+    srv, prov = fake_prov()
+    prov.current_cursor = 1
+    events = list(prov._short_poll())
+    assert len(events) == 1
+    event = events[0]
+    assert (event.otype, event.oid, event.path, event.hash, event.exists) == (FILE, "555", "/sub/f.txt", "abc", True)
+    assert prov.current_cursor == 1001
+    prov.disconnect()
+
+
+def test_parse_time():
+    expected = 1575125299.0
+    assert BoxProvider._parse_time("2019-11-30T06:48:19-08:00") == expected
+    assert BoxProvider._parse_time("2019-11-30T14:48:19Z") == expected
+    assert BoxProvider._parse_time("2019-11-30T14:48:19") == expected
+    with patch("cloudsync.providers.box.arrow.get", side_effect=AssertionError("arrow used")):
+        assert BoxProvider._parse_time("2019-11-30T14:48:19Z") == expected
+        assert BoxProvider._parse_time("2019-11-30T14:48:19.250Z") == expected + 0.25
+
+
+def test_short_poll_fetched_path_memo():
+    srv, prov = fake_prov()
+    srv.bare_events = 3
+    prov.current_cursor = 1
+    events = list(prov._short_poll())
+    assert [e.path for e in events] == ["/sub/f.txt", "/g.txt", "/g.txt", "/g.txt"]
+    assert len(srv.calls["files/556"]) == 1
+    prov.disconnect()
+
+
+def test_short_poll_web_link_without_path():
+    srv, prov = fake_prov()
+    srv.bare_links = 1
+    prov.current_cursor = 1
+    events = list(prov._short_poll())
+    assert [(e.oid, e.path) for e in events] == [("555", "/sub/f.txt"), ("557", "/sub/link.url")]
+    assert len(srv.calls["web_links/557"]) == 1
+    prov.disconnect()
+
+
+def test_listdir():
+    srv, prov = fake_prov()
+    names = [ent.name for ent in prov.listdir('0')]
+    assert names == ['0109d27be3d76224f640e6076c77184d', '037c2561c96ec54635d50f71ae13ab72']
+    assert prov._BoxProvider__cache.get_oid('/037c2561c96ec54635d50f71ae13ab72') == '95382018330'
+    _, (ctx, _) = srv.calls["folders/0/items"][0]
+    assert urllib.parse.parse_qs(ctx["QUERY_STRING"])["useMarker"] == ["True"]
+    prov.disconnect()
+
+
+def test_not_found_cache():
+    srv, prov = fake_prov()
+    prov._not_found_ttl = 60
+    assert prov.info_oid("404") is None
+    assert len(srv.calls["files/404"]) == 1
+    assert prov.info_oid("404") is None
+    assert len(srv.calls["files/404"]) == 1
+    prov._clear_cache()
+    assert prov.info_oid("404") is None
+    assert len(srv.calls["files/404"]) == 2
+    prov.disconnect()
+
+
+def test_not_found_forgotten_on_create_conflict():
+    srv, prov = fake_prov()
+    prov._not_found_ttl = 60
+    key = ("path", "/small")
+    assert prov.info_path("/small") is None
+    assert key in prov._BoxProvider__not_found
+    srv.upload_conflict = True
+    with pytest.raises(CloudFileExistsError):
+        prov.create("/small", io.BytesIO(b'123'))
+    assert key not in prov._BoxProvider__not_found
+    prov.disconnect()
+
+
+def test_get_items_pages():
+    srv, prov = fake_prov()
+    with prov._api() as client:
+        # as fetched by _get_box_object, which always includes item_collection
+        folder = client.translator.translate(client.session, {
+            'type': 'folder', 'id': '88', 'name': 'big',
+            'item_collection': {'total_count': 5, 'entries': []}})
+        entries = prov._box_get_items(client, folder, '/big')
+    assert [e.name for e in entries] == ['f0', 'f1', 'f2', 'f3', 'f4']
+    assert len(srv.calls["folders/88/items"]) == 3
+    assert prov._BoxProvider__cache.get_oid('/big/f3') == '903'
+    prov.disconnect()
+
+
+def test_cache_listed_children_metadata():
+    srv, prov = fake_prov()
+    with prov._api() as client:
+        folder = client.translator.translate(client.session, {
+            'type': 'folder', 'id': '88', 'name': 'big', 'content_modified_at': '2019-12-12T06:48:48-08:00',
+            'path_collection': {'total_count': 1, 'entries': [{'type': 'folder', 'id': '0', 'name': 'All Files'}]},
+            'item_collection': {'total_count': 2, 'entries': [
+                {'type': 'file', 'id': '900', 'name': 'f0', 'sha1': 'abc', 'size': 3,
+                 'content_modified_at': '2019-12-12T06:48:48-08:00'},
+                {'type': 'file', 'id': '901', 'name': 'f1', 'sha1': 'abc'}]}})
+        prov._BoxProvider__box_cache_object(client, folder, '/big')
+    info = prov.info_path('/big/f0')
+    assert (info.oid, info.hash, info.size) == ('900', 'abc', 3)
+    assert not prov._BoxProvider__cache.get_metadata(path='/big/f1')
+    assert prov._BoxProvider__cache.get_oid('/big/f1') == '901'
+    prov.disconnect()
+
+
+def test_unlocked_api():
+    srv, prov = fake_prov()
+
+    def other_thread_can_lock(results):
+        results.append(prov._mutex.acquire(timeout=1))
+        if results[-1]:
+            prov._mutex.release()
+
+    results: List[bool] = []
+    with prov._api(locked=False):
+        t = threading.Thread(target=other_thread_can_lock, args=(results,))
+        t.start()
+        t.join()
+    with prov._api():
+        t = threading.Thread(target=other_thread_can_lock, args=(results,))
+        t.start()
+        t.join()
+    assert results == [True, False]
+    prov.disconnect()
+
+
+def test_api_guard_follows_client():
+    srv, prov = fake_prov()
+    guard = prov._api()
+    assert prov._api() is guard
+    # as if connect swapped the client while the old guard was still set
+    client = copy.copy(guard.client)
+    prov._BoxProvider__client = client
+    assert prov._api().client is client
+    assert prov._api(locked=False).client is client
+    prov.disconnect()
+
+
+def test_path_lookup_caches_oid():
+    srv, prov = fake_prov()
+    path = '/0109d27be3d76224f640e6076c77184d'
+    assert prov._BoxProvider__cache.get_oid(path) is None
+    with prov._api() as client:
+        assert prov._get_box_object(client, path=path, object_type=DIRECTORY)
+    assert prov._BoxProvider__cache.get_oid(path) == '95401994626'
+    prov.disconnect()
+
+
+def test_get_items_past_max_offset():
+    srv, prov = fake_prov()
+    prov._items_max_offset = 4
+    with prov._api() as client:
+        entries = prov._box_get_items(client, client.folder('88'), '/big')
+    assert [e.name for e in entries] == ['f0', 'f1', 'f2', 'f3', 'f4']
+    # the 1 item page that found the size, then 3 marker pages
+    assert len(srv.calls["folders/88/items"]) == 4
+    assert prov._BoxProvider__cache.get_oid('/big/f4') == '904'
+
+    # a fetched folder already knows its size, so no request is spent finding it
+    with prov._api() as client:
+        folder = client.translator.translate(client.session, {
+            'type': 'folder', 'id': '88', 'name': 'big',
+            'item_collection': {'total_count': 5, 'entries': []}})
+        entries = prov._box_get_items(client, folder, '/big')
+    assert [e.name for e in entries] == ['f0', 'f1', 'f2', 'f3', 'f4']
+    assert len(srv.calls["folders/88/items"]) == 7
+    prov.disconnect()
+
+
+def test_path_lookup_through_listed_folder():
+    srv, prov = fake_prov()
+    prov._BoxProvider__cache.set_oid('/wide', '300', DIRECTORY)
+    # d120 is past the 100 mini entries, so it is only found by listing /wide
+    info = prov.info_path('/wide/d120/leaf')
+    assert (info.oid, info.otype) == ('421', FILE)
+    assert srv.calls["folders/300/items"]
+    prov.disconnect()
+
+
+def test_get_quota():
+    srv, prov = fake_prov()
+    assert prov.get_quota() == {'used': 5551503, 'limit': 10737418240,
+                                'login': 'AutomationUser_813890_GmcM3Cohcy@boxdevedition.com'}
+    _, (ctx, _) = srv.calls["users/me"][-1]
+    assert urllib.parse.parse_qs(ctx["QUERY_STRING"])["fields"] == ["space_used,space_amount,login"]
+    prov.disconnect()
+
+
+def test_long_poll_server_retries():
+    srv, prov = fake_prov()
+    prov._long_poll_manager.stop(forever=True)
+    prov._base_box_url = srv.uri().rstrip("/")
+    for _ in range(3):
+        assert prov._long_poll(5)
+    assert len(srv.calls["realtime"]) == 3
+    # max_retries is 2, so the third poll asked for a new realtime server
+    assert len(srv.calls["realtime_servers"]) == 2
+    prov.disconnect()
+
+
+def test_exists_oid_single_fetch():
+    srv, prov = fake_prov()
+    assert prov.exists_oid("556")
+    assert len(srv.calls["files/556"]) == 1
+    assert not prov.exists_oid("404")
+    prov.disconnect()
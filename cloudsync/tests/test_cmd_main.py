@@ -75,3 +75,17 @@ def test_main_err(capsys):
     assert rd.err != ""
     # verbose logs a traceback on failz
     assert "aceback" in rd.err
+
+
+def test_main_lazy_import(capsys, monkeypatch):
+    sys.argv = ["cloudsync", "--help"]
+    for mod in ("cloudsync.command.debug", "cloudsync.command.sync", "cloudsync.command.list"):
+        monkeypatch.delitem(sys.modules, mod, raising=False)
+
+    with pytest.raises(SystemExit):
+        main()
+
+    rd = capsys.readouterr()
+    for cmd in ("debug", "sync", "list"):
+        assert cmd in rd.out
+    assert "cloudsync.command.sync" not in sys.modules
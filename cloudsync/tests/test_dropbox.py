@@ -8,6 +8,7 @@ from typing import Generator
 from unittest.mock import patch, Mock
 
 from cloudsync.providers import DropboxProvider
+from cloudsync.providers.dropbox import NotAFileError
 
 import dropbox
 
@@ -50,3 +51,26 @@ def test_events(fi: Mock):
     assert ev1.mtime > 0
 
     log.info("evs %s", evs)
+
+
+@patch("cloudsync.providers.dropbox._FolderIterator")
+def test_events_forget_deleted_parent(fi: Mock):
+    db = DropboxProvider()
+    db._remember_verified_parent("/a")
+    db._remember_verified_parent("/a/b")
+    db._remember_verified_parent("/c")
+
+    def mock_iterate(*_a, **_kw) -> Generator[dropbox.files.Metadata, None, None]:
+        yield dropbox.files.DeletedMetadata(name="A", path_display="/A", path_lower="/a")
+
+    fi.side_effect = mock_iterate
+
+    def mock_api(*_a, **_kw):
+        raise NotAFileError()
+
+    with patch.object(db, "_api", mock_api):
+        evs = list(db._events(cursor=None))
+
+    assert len(evs) == 1
+    assert not evs[0].exists
+    assert list(db._Provider__verified_parents) == ["/c"]
@@ -62,6 +62,40 @@ def test_fast_hash(fsp: FileSystemProvider, tmpdir):
     assert h1 != h3
 
 
+def test_fast_hash_size_change(fsp: FileSystemProvider, tmpdir):
+    f = tmpdir / "file"
+
+    # same first and last 1k, same mtime, different size in the middle
+    f.write(b"a"*1024 + b"b"*10 + b"c"*1024)
+    st = os.stat(str(f))
+    h1 = fsp._fast_hash_path(str(f))
+
+    f.write(b"a"*1024 + b"b"*20 + b"c"*1024)
+    os.utime(str(f), ns=(st.st_atime_ns, st.st_mtime_ns))
+    h2 = fsp._fast_hash_path(str(f))
+
+    assert h1 != h2
+    with open(str(f), "rb") as fh:
+        assert h2 == get_hash(fh)
+
+
+def test_fast_hash_file_replaced(fsp: FileSystemProvider, tmpdir):
+    f = tmpdir / "file"
+    g = tmpdir / "other"
+
+    # same size, edges and mtime, but a different file swapped in (atomic save, cp -p, etc)
+    f.write(b"a"*1024 + b"b"*10 + b"c"*1024)
+    st = os.stat(str(f))
+    h1 = fsp._fast_hash_path(str(f))
+
+    g.write(b"a"*1024 + b"d"*10 + b"c"*1024)
+    os.utime(str(g), ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(str(g), str(f))
+    h2 = fsp._fast_hash_path(str(f))
+
+    assert h1 != h2
+
+
 def test_cursor_prune(fsp):
     fsp._event_window = 20
     cs1 = fsp.latest_cursor
@@ -98,3 +132,7 @@ def test_cursor_prune(fsp):
     assert fsp.current_cursor == cpos
 
     assert i == 20
+
+    # events still land after the window was pruned
+    fsp._on_any_event(watchdog_events.FileCreatedEvent("/file100"))
+    assert [ev.oid for ev in fsp.events()] == ["/file100"]
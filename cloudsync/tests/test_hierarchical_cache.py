@@ -114,6 +114,25 @@ def test_delete_non_empty_folder():
     check_walk(cache, walk)
 
 
+def test_delete_deep_folder():
+    cache = new_cache()
+    oids = {}
+    path = ''
+    for name in "abcde":
+        path += '/' + name
+        oids[path] = new_oid()
+        cache.mkdir(path, oids[path])
+        oids[path + '/f'] = new_oid()
+        cache.create(path + '/f', oids[path + '/f'])
+
+    cache.delete(path='/a/b')
+    for path, oid in oids.items():
+        expected = None if path.startswith('/a/b') else path
+        assert cache.get_path(oid) == expected
+    check_walk(cache, ['/', '/a', '/a/f'])
+    check_structure(cache)
+
+
 def check_walk(cache: HierarchicalCache, walk):
     assert sorted(list(cache)) == sorted(walk)
 
@@ -24,6 +24,14 @@ class TokenServer(ApiServer):
         }
 
 
+@pytest.fixture(name="token_server", scope="module")
+def fixture_token_server():
+    t = TokenServer("127.0.0.1", 0)
+    threading.Thread(target=t.serve_forever, daemon=True).start()
+    yield t
+    t.shutdown()
+
+
 def x_test_oauth():
     OAuthRedirServer.SHUFFLE_PORTS = False
     os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
@@ -77,13 +85,10 @@ def test_oauth_threaded(wb):
 
 
 @patch('webbrowser.open')
-def test_oauth_refresh(wb):
-    os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
-
-    t = TokenServer("127.0.0.1", 0)
-    threading.Thread(target=t.serve_forever, daemon=True).start()
+def test_oauth_refresh(wb, token_server, monkeypatch):
+    monkeypatch.setenv('OAUTHLIB_INSECURE_TRANSPORT', '1')
 
-    token_url = t.uri("/token")
+    token_url = token_server.uri("/token")
 
     o = OAuthConfig(app_id="foo", app_secret="bar")
     res = o.refresh(token_url, "token", ["scope"])
@@ -93,14 +98,11 @@ def test_oauth_refresh(wb):
 
 
 @patch('webbrowser.open')
-def test_oauth_interrupt(wb):
-    os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
+def test_oauth_interrupt(wb, token_server, monkeypatch):
+    monkeypatch.setenv('OAUTHLIB_INSECURE_TRANSPORT', '1')
 
-    t = TokenServer("127.0.0.1", 0)
-    threading.Thread(target=t.serve_forever, daemon=True).start()
-
-    auth_url = t.uri("/auth")
-    token_url = t.uri("/token")
+    auth_url = token_server.uri("/auth")
+    token_url = token_server.uri("/token")
 
     o = OAuthConfig(app_id="foo", app_secret="bar", port_range=(54045, 54099), host_name="localhost")
     o.start_auth(auth_url)
@@ -111,15 +113,12 @@ def test_oauth_interrupt(wb):
 
 
 @patch('webbrowser.open')
-def test_oauth_defaults(wb):
+def test_oauth_defaults(wb, token_server, monkeypatch):
 
     # when CI testing, oauth providers stick tokens, ids, and secrets in the environment
-    os.environ["TEST_APP_ID"] = "123"
-    os.environ["TEST_APP_SECRET"] = "456"
-    os.environ["TEST_TOKEN"] = "ABC|DEF"
-
-    t = TokenServer("127.0.0.1", 0)
-    threading.Thread(target=t.serve_forever, daemon=True).start()
+    monkeypatch.setenv("TEST_APP_ID", "123")
+    monkeypatch.setenv("TEST_APP_SECRET", "456")
+    monkeypatch.setenv("TEST_TOKEN", "ABC|DEF")
 
     # here's an oauth provider
     class Prov(MockProvider):
@@ -128,8 +127,8 @@ def test_oauth_defaults(wb):
         def __init__(self, oc: OAuthConfig):
             self._oauth_config = oc
         _oauth_info = OAuthProviderInfo(             # signal's oauth mode
-            auth_url=t.uri("/auth"),
-            token_url=t.uri("/token"),
+            auth_url=token_server.uri("/auth"),
+            token_url=token_server.uri("/token"),
             scopes=[],
         )
 
@@ -141,11 +140,15 @@ def test_oauth_defaults(wb):
     # actually test the instance
     creds = None
     creds_ex = None
-    os.environ['OAUTHLIB_INSECURE_TRANSPORT'] = '1'
+    monkeypatch.setenv('OAUTHLIB_INSECURE_TRANSPORT', '1')
 
     # this is a blocking function, set an event when creds are found
     event = threading.Event()
 
+    # released each time the auth thread launches the browser
+    opened = threading.Semaphore(0)
+    wb.side_effect = lambda *_a, **_k: opened.release()
+
     def auth():
         nonlocal creds
         nonlocal creds_ex
@@ -157,15 +160,10 @@ def test_oauth_defaults(wb):
             raise
     threading.Thread(target=auth, daemon=True).start()
 
-    while True:
-        try:
-            wb.assert_called_once()
-            # pretend user clicked ok
-            requests.get(inst._oauth_config.redirect_uri, params={"code": "cody"})
-            break
-        except AssertionError:
-            # webbrowser not launched yet...
-            pass
+    assert opened.acquire(timeout=10)
+    wb.assert_called_once()
+    # pretend user clicked ok
+    requests.get(inst._oauth_config.redirect_uri, params={"code": "cody"})
 
     # click received, wait for token
     event.wait()
@@ -175,14 +173,9 @@ def test_oauth_defaults(wb):
     creds = None
     th = threading.Thread(target=auth, daemon=True)
     th.start()
-    while True:
-        try:
-            assert wb.call_count == 2
-            inst.interrupt_auth()
-            break
-        except AssertionError:
-            # webbrowser not launched yet...
-            pass
+    assert opened.acquire(timeout=10)
+    assert wb.call_count == 2
+    inst.interrupt_auth()
     th.join()
 
     assert creds is None
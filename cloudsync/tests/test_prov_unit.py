@@ -1,3 +1,13 @@
+import time
+import threading
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+
+from cloudsync.exceptions import CloudFileNotFoundError
+from cloudsync.provider import Provider
+
 from .fixtures import MockProvider
 
 
@@ -7,3 +17,175 @@ def test_subpath():
     y = "c:/Users/hello"
 
     assert m.is_subpath(y, x)
+
+
+def test_normalize_path_custom_sep():
+    class ColonSep(MockProvider):
+        sep = ":"
+        alt_sep = "|"
+
+    m = ColonSep(False, True)
+    assert m.normalize_path("::a|b::c:") == ":a:b:c"
+    assert MockProvider(False, True).normalize_path("//a\\\\b//c/") == "/a/b/c"
+
+
+def test_multichar_sep():
+    class ArrowSep(MockProvider):
+        sep = "->"
+        alt_sep = ""
+
+    m = ArrowSep(False, True)
+    assert m.normalize_path("->->a->b") == "->a->b"
+    assert m.is_subpath("->a", "->a->b") == "->b"
+    assert m.is_subpath("->a", "->a-b") is False
+    assert m.split("->a->b") == ("->a", "b")
+    # names ending in one of the separator's characters keep it
+    assert m.normalize_path("->a->b-") == "->a->b-"
+    assert m.normalize_path("->a->b->->") == "->a->b"
+    assert m.split("->a->b>") == ("->a", "b>")
+    assert m.split("->a->b-->") == ("->a", "b-")
+    assert m.join("->a-", ">b->") == "->a-->>b"
+    assert m.normalize_path_separators("->a>->") == "->a>"
+
+
+def test_subpath_case():
+    m = MockProvider(False, False)
+    assert m.is_subpath("/A/b", "/a/B/cD") == "/cD"
+    assert m.is_subpath("/A/b", "/a/Bc") is False
+    assert m.is_subpath("/a", "/A", strict=True) is False
+    assert m.is_subpath("/a", "/A/") == "/"
+
+    m = MockProvider(False, True)
+    assert m.is_subpath("/A/b", "/a/B/cD") is False
+    assert m.is_subpath("/A/b", "/A/b/cD") == "/cD"
+
+
+def test_verified_parent_cache():
+    m = MockProvider(False, False)
+    m.connect({"key": "val"})
+    m.mkdir("/a")
+    m.mkdir("/a/b")
+
+    m._parent_cache_ttl = 60
+    with patch.object(m, "info_path", wraps=m.info_path) as info_path:
+        m._verify_parent_folder_exists("/a/b/c")
+        m._verify_parent_folder_exists("/A/B/d")
+        assert info_path.call_count == 1
+
+        m._forget_verified_parents("/a")
+        m._verify_parent_folder_exists("/a/b/c")
+        assert info_path.call_count == 2
+
+    m.delete(m.info_path("/a/b").oid)
+    m._forget_verified_parents("/a/b")
+    with pytest.raises(CloudFileNotFoundError):
+        m._verify_parent_folder_exists("/a/b/c")
+
+
+def test_verified_parent_cache_threads():
+    m = MockProvider(False, False)
+    m._parent_cache_ttl = 60
+    done = threading.Event()
+
+    def remember():
+        for i in range(20000):
+            m._remember_verified_parent("/a/%s" % i)
+        done.set()
+
+    t = threading.Thread(target=remember, daemon=True)
+    t.start()
+    while not done.is_set():
+        m._forget_verified_parents("/b")
+    t.join()
+    m._forget_verified_parents("/a")
+    assert not m._Provider__verified_parents
+
+
+def test_walk_verifies_parents():
+    m = MockProvider(False, True)
+    m.connect({"key": "val"})
+    m.mkdir("/a")
+    m.mkdir("/a/b")
+    m._parent_cache_ttl = 60
+
+    assert len(list(m.walk("/"))) == 2
+    with patch.object(m, "info_path", wraps=m.info_path) as info_path:
+        m._verify_parent_folder_exists("/a/b/c")
+        info_path.assert_not_called()
+
+
+def test_normalize_path_for_display():
+    m = MockProvider(False, False)
+    assert m.normalize_path("/A//B\\cD/") == "/a/b/cd"
+    assert m.normalize_path("/A//B\\cD/", for_display=True) == "/a/b/cD"
+    assert m.normalize_path("/cD", for_display=True) == "/cD"
+    assert m.normalize_path("/", for_display=True) == "/"
+    Provider.clear_path_cache()
+    assert m.normalize_path("/A//B\\cD/", for_display=True) == "/a/b/cD"
+
+
+def test_paths_match():
+    m = MockProvider(False, False)
+    assert m.paths_match(None, None)
+    assert not m.paths_match(None, "/a")
+    assert m.paths_match("/A//b/", "\\a\\B")
+    assert not m.paths_match("/a/b", "/a/c")
+    assert not MockProvider(False, True).paths_match("/A", "/a")
+
+
+def test_walk_concurrent():
+    m = MockProvider(False, True)
+    m.connect({"key": "val"})
+    for d in ("/a", "/a/b", "/a/b/c", "/d", "/d/e"):
+        m.mkdir(d)
+        m.create(d + "/f", BytesIO(b"data"))
+
+    serial = list(m.walk("/"))
+    m._walk_concurrency = 3
+    concurrent = list(m.walk("/"))
+
+    assert sorted(e.path for e in serial) == sorted(e.path for e in concurrent)
+    seen = set()
+    for e in concurrent:
+        assert m.dirname(e.path) == "/" or m.dirname(e.path) in seen
+        seen.add(e.path)
+
+
+def test_walk_concurrent_abandoned():
+    m = MockProvider(False, True)
+    m.connect({"key": "val"})
+    for i in range(8):
+        m.mkdir("/d%s" % i)
+        m.create("/d%s/f" % i, BytesIO(b"data"))
+
+    listed = []
+    real_listdir = m.listdir
+
+    def slow_listdir(oid):
+        listed.append(oid)
+        time.sleep(0.1)
+        return real_listdir(oid)
+
+    m._walk_concurrency = 2
+    with patch.object(m, "listdir", slow_listdir):
+        walk = m.walk("/")
+        for _ in range(9):  # the 8 folders, then the first of their files
+            next(walk)
+        walk.close()
+        time.sleep(0.5)
+    # all 8 folders were queued, but only the ones already being listed when the walk stopped ran
+    assert len(listed) <= 5
+
+
+def test_join_pair():
+    Provider.clear_path_cache()
+    for parent, name in (("/a/", "b/"), ("", "b"), ("a", ""), ("/", "//"), ("/a", "/b/c")):
+        expected = Provider.join([parent, name])
+        assert Provider.join(parent, name) == expected
+        assert Provider.join(parent, name) == expected
+    assert Provider.join("/a/", "b/") == "/a/b"
+    # a first component of only separators is dropped, so the next one keeps its leading separators
+    assert Provider.join("//", "///a") == "///a"
+    assert Provider.join("//", "///a") == "///a"
+    assert Provider.join(["//", "///a"]) == "///a"
+    assert Provider.join("/", "///a") == "/a"
@@ -576,6 +576,7 @@ def test_join(mock_provider):
             assert "/" == mock_provider.join("//", "//")
 
             # list is comprised of path strings only
+            assert "/a" == mock_provider.join("a")
             assert "/a/b/c" == mock_provider.join("a", "b", "c")
             assert "/a/c" == mock_provider.join("a", None, "c")
             assert "/a/b/c" == mock_provider.join("/a", "/b", "/c")
@@ -2700,6 +2701,9 @@ def test_replace_path(provider):
     assert provider.replace_path("/a/b", "\\a", "\\c") == "/c/b"
     assert provider.replace_path("\\a/b", "\\a", "\\c") == "/c/b"
     assert provider.replace_path("\\a\\b", "\\a", "\\c") == "/c/b"
+    assert provider.replace_path("/a", "/a", "/c") == "/c"
+    assert provider.replace_path("/a/b", "/a", "/") == "/b"
+    assert provider.replace_path("/a/b", "/", "/c") == "/c/a/b"
 
 
 def test_normalize_path_separators(provider):
@@ -1,9 +1,13 @@
 import logging
+import sqlite3
 from io import BytesIO
 from typing import Dict, Any
+from unittest.mock import patch
 
 import pytest
 
+from cloudsync import SqliteStorage
+from cloudsync.utils import NamedTemporaryFile
 from cloudsync import SyncState, SyncEntry, LOCAL, REMOTE, FILE, DIRECTORY, EXISTS, UNKNOWN, TRASHED, CORRUPT
 from cloudsync.sync.state import SideState
 from .fixtures import MockStorage
@@ -294,6 +298,32 @@ def test_state_storage2(mock_provider):
     assert not state_diff(state, state2)
 
 
+def test_state_storage_skips_unchanged(mock_provider):
+    providers = (mock_provider, mock_provider)
+    backend: Dict[Any, Any] = {}
+    storage = MockStorage(backend)
+    state = SyncState(providers, storage, tag="whatever")
+    state.update(LOCAL, FILE, path="123", oid="123", hash=b"123")
+    state.storage_commit()
+
+    ent1 = state.lookup_oid(LOCAL, "123")
+    with patch.object(storage, "update", wraps=storage.update) as update:
+        ent1[LOCAL].hash = b"123"
+        state.storage_commit()
+        assert update.call_count == 0
+        ent1[LOCAL].hash = b"456"
+        state.storage_commit()
+        assert update.call_count == 1
+
+    state2 = SyncState(providers, storage, tag="whatever")
+    assert not state_diff(state, state2)
+    with patch.object(storage, "update", wraps=storage.update) as update:
+        ent2 = state2.lookup_oid(LOCAL, "123")
+        ent2[LOCAL].hash = b"456"
+        state2.storage_commit()
+        assert update.call_count == 0
+
+
 def test_state_storage3(mock_provider):
     providers = (mock_provider, mock_provider)
     backend: Dict[Any, Any] = {}
@@ -345,6 +375,52 @@ def test_state_storage_bad_hash(mock_provider):
     assert state_diff(state, state2), "tuples used instead of lists"
 
 
+def test_state_storage_failed_batch(mock_provider):
+    providers = (mock_provider, mock_provider)
+    f = NamedTemporaryFile(mode=None)
+    storage = SqliteStorage(f.name)
+    state = SyncState(providers, storage, tag="whatever")
+    state.update(LOCAL, FILE, path="123", oid="123", hash=b"123")
+    state.storage_commit()
+
+    real_db = storage.db
+    writes = 0
+
+    class FailingDb:
+        def execute(self, sql, *args):
+            nonlocal writes
+            if sql.startswith(("INSERT", "UPDATE")):
+                writes += 1
+                if writes == 2:
+                    # sqlite rolls back on its own for errors like SQLITE_FULL
+                    real_db.execute("ROLLBACK")
+                    raise sqlite3.OperationalError("database or disk is full")
+            return real_db.execute(sql, *args)
+
+        def __getattr__(self, name):
+            return getattr(real_db, name)
+
+    state.update(LOCAL, FILE, path="123", oid="123", hash=b"1234")
+    state.update(LOCAL, FILE, path="456", oid="456", hash=b"456")
+    state.update(LOCAL, FILE, path="789", oid="789", hash=b"789")
+    storage.db = FailingDb()
+    with pytest.raises(sqlite3.OperationalError):
+        state.storage_commit()
+    storage.db = real_db
+
+    # nothing from the failed batch was kept, and the state knows it
+    assert len(storage.read_all("whatever")) == 1
+    state.storage_commit()
+    assert len(storage.read_all("whatever")) == 3
+
+    state2 = SyncState(providers, storage, tag="whatever")
+    assert not state_diff(state, state2)
+    assert state2.lookup_oid(LOCAL, "123")[LOCAL].hash == b"1234"
+
+    storage.close()
+    del f
+
+
 def test_state_storage_corrupt_input(mock_provider):
     providers = (mock_provider, mock_provider)
     backend: Dict[Any, Any] = {}
@@ -363,3 +439,38 @@ def test_state_storage_corrupt_input(mock_provider):
     # 123 record was corrupt, but 456 is still cool
     assert not state2.lookup_oid(LOCAL, "123")
     assert state2.lookup_oid(LOCAL, "456")
+
+
+def test_state_entry_slots(mock_provider):
+    providers = (mock_provider, mock_provider)
+    state = SyncState(providers, shuffle=False)
+    state.update(LOCAL, FILE, path="123", oid="123", hash=b"123")
+    ent = state.lookup_oid(LOCAL, "123")
+
+    assert not hasattr(ent, "__dict__")
+    assert not hasattr(ent[LOCAL], "__dict__")
+    with pytest.raises(AttributeError):
+        ent._bogus = 1
+    with pytest.raises(AttributeError):
+        ent[LOCAL]._bogus = 1
+    assert "_parent" not in repr(ent[LOCAL])
+    assert "'_oid': '123'" in repr(ent[LOCAL])
+
+
+def test_state_rename_dir(mock_provider):
+    providers = (mock_provider, mock_provider)
+    state = SyncState(providers, shuffle=False)
+    state.update(LOCAL, DIRECTORY, path="/a", oid="a")
+    state.update(LOCAL, FILE, path="/a/x", oid="x", hash=b"x")
+    state.update(LOCAL, FILE, path="/a/y", oid="y", hash=b"y")
+    state.update(LOCAL, FILE, path="/b", oid="b", hash=b"b")
+
+    state.rename_dir(LOCAL, "/a", "/c", mock_provider.is_subpath,
+                     lambda path, from_dir, to_dir: to_dir + path[len(from_dir):])
+
+    assert state.lookup_oid(LOCAL, "x")[LOCAL].path == "/c/x"
+    assert state.lookup_oid(LOCAL, "y")[LOCAL].path == "/c/y"
+    assert state.lookup_path(LOCAL, "/c/x") == [state.lookup_oid(LOCAL, "x")]
+    assert not state.lookup_path(LOCAL, "/a/x")
+    assert not state.lookup_path(LOCAL, "/a")
+    assert state.lookup_oid(LOCAL, "b")[LOCAL].path == "/b"
@@ -1,4 +1,5 @@
 import os
+import sqlite3
 from typing import Dict
 
 import pytest
@@ -49,3 +50,50 @@ def test_storage_close(store):
         os.unlink(store._filename)
     # ok to close twice
     store.close()
+
+
+def test_storage_transaction(store):
+    id1 = store.create("tag", b'bar')
+    with store.transaction():
+        id2 = store.create("tag", b'baz')
+        store.update("tag", b'foo', id1)
+    assert store.read_all("tag") == {id1: b'foo', id2: b'baz'}
+
+    with pytest.raises(ValueError):
+        with store.transaction():
+            store.update("tag", b'qux', id1)
+            store.update("tag", b'qux', id2 + 1000)
+    if isinstance(store, SqliteStorage):
+        # the whole block is rolled back
+        assert store.read_all("tag") == {id1: b'foo', id2: b'baz'}
+    else:
+        # write-through, writes made before the error are kept
+        assert store.read_all("tag") == {id1: b'qux', id2: b'baz'}
+
+
+def test_storage_transaction_commit_fails(sqlite_store):
+    store = sqlite_store
+    id1 = store.create("tag", b'bar')
+    real_db = store.db
+
+    class FailingCommitDb:
+        def execute(self, sql, *args):
+            if sql == "COMMIT":
+                raise sqlite3.OperationalError("database is locked")
+            return real_db.execute(sql, *args)
+
+        def __getattr__(self, name):
+            return getattr(real_db, name)
+
+    store.db = FailingCommitDb()
+    with pytest.raises(sqlite3.OperationalError):
+        with store.transaction():
+            store.update("tag", b'baz', id1)
+    store.db = real_db
+    assert not real_db.in_transaction
+
+    # the next write is autocommitted, not left in an abandoned transaction
+    store.update("tag", b'qux', id1)
+    other = SqliteStorage(store._filename)
+    assert other.read_all("tag") == {id1: b'qux'}
+    other.close()
@@ -175,7 +175,7 @@ def test_sync_basic(sync: "SyncMgrMixin"):
         try:
             has_info[0] = sync.providers[LOCAL].info_path("/local/stuff1")
             has_info[1] = sync.providers[LOCAL].info_path("/local/stuff2")
-            has_info[2] = sync.providers[REMOTE].info_path("/remote/stuff2")
+            has_info[2] = sync.providers[REMOTE].info_path("/remote/stuff1")
             has_info[3] = sync.providers[REMOTE].info_path("/remote/stuff2")
         except CloudFileNotFoundError as e:
             log.debug("waiting for %s", e)
@@ -2029,6 +2029,19 @@ def test_sync_fnf_during_sync(sync):
     sync.run_until_found((REMOTE, "remote/b"))
 
 
+def test_sync_upload_temp_missing(sync):
+    (local, _remote) = sync.providers
+    setup_remote_local(sync)
+
+    lb = local.create("/local/b", BytesIO(b'hello'))
+    sync.create_event(LOCAL, FILE, path="/local/b", oid=lb.oid, exists=True, hash=lb.hash)
+    sync.run_until_found((REMOTE, "/remote/b"))
+
+    ent = sync.state.lookup_oid(LOCAL, lb.oid)
+    ent[LOCAL]._temp_file = sync._temp_file()
+    assert not sync.upload_synced(LOCAL, ent)
+
+
 @pytest.mark.parametrize("unverif", [True, False])
 def test_sync_change_count(sync, unverif):
     (local, _remote) = sync.providers